@@ -0,0 +1,52 @@
+import threading
+import pygame
+
+
+SOUND_FILES = [
+    'assets/hover.wav',
+    'assets/play_click.wav',
+    'assets/settings_click.wav',
+    'assets/settings_menu_click.wav',
+    'assets/paddle_hit.wav',
+    'assets/score.wav',
+    'assets/lose.wav',
+    'assets/powerup.wav',
+    'assets/slowdown.wav',
+]
+
+
+class SoundBank:
+    """Process-wide cache of decoded sounds; each file is loaded once and shared."""
+
+    def __init__(self):
+        self.sounds = {}
+        self.lock = threading.Lock()
+        self.loader = None
+
+    def get(self, path):
+        with self.lock:
+            if path not in self.sounds:
+                self.sounds[path] = self.load(path)
+            return self.sounds[path]
+
+    def load(self, path):
+        try:
+            sound = pygame.mixer.Sound(path)
+            sound.set_volume(1.0)
+            return sound
+        except:
+            print(f"Sound file {path} not found")
+            return None
+
+    def preload(self, paths=SOUND_FILES):
+        if self.loader is not None:
+            return
+        self.loader = threading.Thread(target=self.load_all, args=(list(paths),), daemon=True)
+        self.loader.start()
+
+    def load_all(self, paths):
+        for path in paths:
+            self.get(path)
+
+
+sound_bank = SoundBank()
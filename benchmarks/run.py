@@ -0,0 +1,272 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+sys.path.insert(0, ROOT)
+
+
+WRAP_TEXT = ("The ball went straight through the right paddle after the extra ball "
+             "modifier expired and then the score popup stayed on screen until the "
+             "next rally started, this happened twice on hard in fullscreen mode ok")
+
+
+def measure(function, min_time=0.2, repeat=5):
+    """Best-of-repeat rate of function() in calls per second."""
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        calls *= 2
+    calls = max(1, int(calls * (min_time / max(elapsed, 1e-9))))
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return calls / best
+
+
+def physics_benchmarks(add):
+    from game import Paddle, Ball, TICK
+    from physics import BallSet
+
+    for count in (1, 40):
+        balls = BallSet()
+        for i in range(count):
+            Ball(465, 30 + (i * 37) % 480, 30, max_speed=2500, difficulty="hard",
+                 ball_set=balls, rng=seeded_random(i))
+        left = Paddle(20, 210, 20, 120, screen_height=540)
+        right = Paddle(920, 210, 20, 120, screen_height=540)
+        # Keep the paddles in the way so balls keep bouncing between them.
+        left.rect.height = right.rect.height = 540
+        left.rect.y = right.rect.y = 0
+        add(f"physics.move[{count} balls]", measure(lambda: balls.move(left, right, 540, TICK)), "ticks")
+
+
+def ai_benchmarks(add):
+    from game import Paddle, Ball, TICK
+    from physics import BallSet
+    from profiles import get_profiles
+
+    balls = BallSet()
+    Ball(465, 255, 30, ball_set=balls, rng=seeded_random(0))
+    Ball(300, 100, 30, ball_set=balls, rng=seeded_random(1))
+    for difficulty in sorted(get_profiles()):
+        paddle = Paddle(920, 210, 20, 120, is_ai=True, ai_difficulty=difficulty,
+                        screen_height=540, rng=seeded_random(2))
+        add(f"ai_move[{difficulty}]", measure(lambda: paddle.ai_move(balls, TICK)), "ticks")
+
+
+def draw_benchmarks(add, screen):
+    from game import Paddle, Ball
+
+    paddle = Paddle(20, 210, 20, 120, screen_height=540)
+    ball = Ball(465, 255, 30, rng=seeded_random(0))
+    for antialiasing in (True, False):
+        label = "aa" if antialiasing else "no aa"
+        add(f"Paddle.draw[{label}]", measure(lambda: paddle.draw(screen, antialiasing)), "draws")
+        add(f"Ball.draw[{label}]", measure(lambda: ball.draw(screen, antialiasing)), "draws")
+
+
+def textbox_benchmarks(add):
+    from menu import TextBox
+
+    box = TextBox(0, 0, 600, 200)
+    box.text = WRAP_TEXT[:200]
+    add("TextBox.update_wrapped_lines[200 chars]", measure(box.update_wrapped_lines), "calls")
+
+
+def game_benchmarks(add, screen):
+    from game import Game
+
+    game = Game(screen, "hard", seed=1)
+    add("Game.step[hard]", measure(lambda: step_or_restart(game)), "ticks")
+    game.full_redraw = True
+    add("Game.draw", measure(game.draw), "frames")
+
+
+def match_benchmarks(add):
+    from game import Game, HEADLESS_TICK_RATE
+    from profiles import get_profiles
+
+    # The same ten seeded matches every call, so each call is the same work.
+    def run_batch(difficulty, seeds=range(10)):
+        for seed in seeds:
+            game = Game(None, difficulty, headless=True, seed=seed, tick_rate=HEADLESS_TICK_RATE)
+            game.simulate(max_ticks=120 * HEADLESS_TICK_RATE)
+
+    for difficulty in sorted(get_profiles()):
+        rate = measure(lambda: run_batch(difficulty), min_time=1.0, repeat=3)
+        add(f"headless match[{difficulty}]", rate * 10, "matches")
+
+
+def step_or_restart(game):
+    if game.game_over:
+        game.start_match(1)
+    game.step(game.ball.rect.centery)
+
+
+def menu_benchmarks(add, screen):
+    import pygame
+    from menu import Menu
+
+    menu = Menu(screen)
+    frames = [0]
+    target = [0]
+    flip = pygame.display.flip
+
+    # Menu.run loops until an event ends it, so a QUIT is posted on the
+    # flip that completes the requested number of frames.
+    def counting_flip():
+        frames[0] += 1
+        if frames[0] >= target[0]:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        flip()
+
+    def run_frames(count):
+        frames[0] = 0
+        target[0] = count
+        pygame.display.flip = counting_flip
+        try:
+            menu.run()
+        finally:
+            pygame.display.flip = flip
+
+    run_frames(5)
+    batch = 30
+    rate = measure(lambda: run_frames(batch), repeat=3)
+    add("Menu.run frame", rate * batch, "frames")
+
+    # One frame's worth of input from a high-rate mouse sweeping the buttons.
+    burst = [pygame.event.Event(pygame.MOUSEMOTION, pos=(300 + i, 100 + i // 2), rel=(1, 0), buttons=(0, 0, 0))
+             for i in range(500)]
+    add("Menu input[500 motion events]", measure(lambda: dispatch(menu, burst)), "bursts")
+
+
+def dispatch(menu, events):
+    from layout import coalesce_motion
+
+    for event in coalesce_motion(events):
+        menu.layout.handle_event(event)
+
+
+def seeded_random(seed):
+    import random
+    return random.Random(seed)
+
+
+SUITES = {
+    "physics": physics_benchmarks,
+    "ai": ai_benchmarks,
+    "draw": draw_benchmarks,
+    "textbox": textbox_benchmarks,
+    "game": game_benchmarks,
+    "matches": match_benchmarks,
+    "menu": menu_benchmarks,
+}
+NEEDS_SCREEN = {"draw", "game", "menu"}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(suites):
+    import pygame
+
+    pygame.init()
+    screen = pygame.display.set_mode((960, 540))
+    results = {}
+
+    def add(name, rate, unit):
+        results[name] = {"per_second": rate, "unit": unit, "us_per_op": 1e6 / rate}
+        print(f"{name:42} {rate:14,.0f} {unit}/s  {1e6 / rate:10.2f} us")
+
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        for name in suites:
+            if name in NEEDS_SCREEN:
+                SUITES[name](add, screen)
+            else:
+                SUITES[name](add)
+    finally:
+        os.chdir(cwd)
+        pygame.quit()
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    print(f"\ncompared to {baseline_path}:")
+    for name, entry in results.items():
+        if name not in baseline:
+            continue
+        change = entry["per_second"] / baseline[name]["per_second"] - 1
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:42} {change * 100:+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ping bang benchmarks under the SDL dummy drivers")
+    parser.add_argument("suites", nargs="*",
+                        help=f"suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown that counts as a regression (default 0.10 = 10%%)")
+    args = parser.parse_args()
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite: {', '.join(unknown)}")
+
+    import pygame
+
+    suites = args.suites or list(SUITES)
+    results = run(suites)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "revision": git_revision(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "results": results,
+            }, f, indent=2)
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
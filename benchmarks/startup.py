@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child():
+    marks = {}
+    sys.path.insert(0, ROOT)
+
+    import pygame
+    import main
+    marks["imports"] = time.time()
+
+    app = main.PingPong()
+    marks["init"] = time.time()
+
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    app.menu.run()
+    pygame.display.flip()
+    marks["first_frame"] = time.time()
+
+    print(json.dumps(marks))
+    sys.stdout.flush()
+    os._exit(0)
+
+
+def measure(runs):
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+    samples = []
+    for _ in range(runs):
+        start = time.time()
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"],
+                                cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+        marks = json.loads(output.strip().splitlines()[-1])
+        samples.append({name: (value - start) * 1000 for name, value in marks.items()})
+    return samples
+
+
+def summarize(samples):
+    summary = {}
+    for name in samples[0]:
+        values = [sample[name] for sample in samples]
+        summary[name] = {
+            "median_ms": statistics.median(values),
+            "min_ms": min(values),
+            "max_ms": max(values),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time from process start to the first menu frame")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    summary = summarize(measure(args.runs))
+    for name, stats in summary.items():
+        print(f"{name:12} median {stats['median_ms']:7.1f} ms  "
+              f"min {stats['min_ms']:7.1f} ms  max {stats['max_ms']:7.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"runs": args.runs, "startup": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
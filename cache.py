@@ -0,0 +1,184 @@
+import pygame
+from collections import OrderedDict
+
+
+class SpriteCache:
+    """Pre-rendered sprites keyed by (kind, size, color, alive, antialiasing).
+
+    Sprites are stored premultiplied so layered antialiasing edges can be
+    baked into a single surface; draw them with blit_sprite().
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def get(self, key, build):
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = build()
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def paddle(self, size, color, alive, antialiasing_enabled=True):
+        key = ("paddle", tuple(size), color, alive, antialiasing_enabled)
+        return self.get(key, lambda: build_paddle(size, color, antialiasing_enabled))
+
+    def ball(self, size, color, antialiasing_enabled=True):
+        key = ("ball", size, color, True, antialiasing_enabled)
+        return self.get(key, lambda: build_ball(size, color, antialiasing_enabled))
+
+    def disc(self, size, color):
+        key = ("disc", size, color, True, True)
+        return self.get(key, lambda: build_disc(size, color))
+
+
+def blit_sprite(screen, sprite, pos):
+    return screen.blit(sprite, pos, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+
+def build_paddle(size, color, antialiasing_enabled=True):
+    width, height = size
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    if not antialiasing_enabled:
+        surface.fill(color)
+        return surface
+
+    pygame.draw.rect(surface, color, (0, 0, width, height), border_radius=8)
+
+    radius = 8
+    for i in range(radius):
+        alpha = int(255 * (1 - i/radius))
+        edge_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(edge_surface, (*color, alpha),
+                         (0, 0, width, height),
+                         border_radius=radius-i)
+        surface.blit(edge_surface.premul_alpha(), (0, 0),
+                     special_flags=pygame.BLEND_PREMULTIPLIED)
+    return surface
+
+
+def build_ball(size, color, antialiasing_enabled=True):
+    radius = size // 2
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (*color, 255), (radius, radius), radius)
+    if antialiasing_enabled:
+        for i in range(3):
+            edge_radius = radius - i
+            alpha = int(255 * (1 - i/3))
+            pygame.draw.circle(surface, (*color, alpha),
+                               (radius, radius), edge_radius)
+    return surface.premul_alpha()
+
+
+def build_disc(size, color):
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (*color, 255), (size//2, size//2), size//2)
+    return surface.premul_alpha()
+
+
+
+class TextCache:
+    """Rendered text surfaces keyed by (font, text, color, antialias) with LRU eviction.
+
+    Surfaces are shared between callers and must not be modified, apart
+    from set_alpha() immediately before a blit.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+class GradientCache:
+    """Menu background gradients baked once per (colors, resolution)."""
+
+    def __init__(self, max_entries=16, steps=12):
+        self.max_entries = max_entries
+        self.steps = steps
+        self.surfaces = OrderedDict()
+
+    def get(self, colors, size):
+        key = (tuple(colors[0]), tuple(colors[1]), tuple(size))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = build_gradient(colors, size, self.steps)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def draw(self, screen, colors, target_colors=None, progress=1.0):
+        size = screen.get_size()
+        if target_colors is None or tuple(target_colors) == tuple(colors) or progress <= 0:
+            screen.blit(self.get(colors, size), (0, 0))
+            return
+        if progress >= 1:
+            screen.blit(self.get(target_colors, size), (0, 0))
+            return
+
+        eased_progress = progress * progress * (3 - 2 * progress)
+        screen.blit(self.get(colors, size), (0, 0))
+        target = self.get(target_colors, size)
+        target.set_alpha(int(255 * eased_progress))
+        screen.blit(target, (0, 0))
+        target.set_alpha(None)
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+def build_gradient(colors, size, steps=12):
+    bg_start, bg_end = colors
+    width, height = size
+    surface = pygame.Surface((width, height))
+    surface.fill(bg_start)
+    step_height = height / steps
+
+    for i in range(steps):
+        r = int(bg_start[0] + (bg_end[0] - bg_start[0]) * (i / steps))
+        g = int(bg_start[1] + (bg_end[1] - bg_start[1]) * (i / steps))
+        b = int(bg_start[2] + (bg_end[2] - bg_start[2]) * (i / steps))
+        pygame.draw.rect(surface, (r, g, b),
+                         (0, i * step_height, width, step_height + 1))
+    return surface
+
+
+fonts = {}
+
+
+def get_font(size, name=None):
+    font = fonts.get((name, size))
+    if font is None:
+        font = pygame.font.Font(name, size)
+        fonts[(name, size)] = font
+    return font
+
+
+sprite_cache = SpriteCache()
+text_cache = TextCache()
+gradient_cache = GradientCache()
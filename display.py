@@ -0,0 +1,98 @@
+import pygame
+
+
+DEFAULT_SIZE = (960, 540)
+
+DISPLAY_SETTINGS = ("fullscreen", "resolution", "render_resolution")
+
+# Share of the desktop a window may take, leaving room for its title bar
+# and the taskbar.
+DESKTOP_FIT = 0.9
+
+
+def parse_resolution(text, default=DEFAULT_SIZE):
+    """Reads a "1920x1080" style setting, falling back to default."""
+    try:
+        width, height = (int(part) for part in str(text).lower().split("x"))
+    except ValueError:
+        return default
+    if width <= 0 or height <= 0:
+        return default
+    return width, height
+
+
+def desktop_size():
+    try:
+        sizes = pygame.display.get_desktop_sizes()
+    except (AttributeError, pygame.error):
+        return None
+    return tuple(sizes[0]) if sizes else None
+
+
+class Display:
+    """Sets the display mode from the settings.
+
+    Everything is drawn on a screen surface of the logical size (the
+    "render_resolution" setting). When the window ("resolution") or
+    fullscreen differs from that, pygame.SCALED lets SDL stretch the
+    surface onto it, so a 1080p screen costs no more to fill than the
+    logical size does. pygame keeps the same screen surface across mode
+    changes, so the scenes holding it never need rebuilding.
+    """
+
+    def __init__(self, settings, caption=None):
+        self.settings = settings
+        self.caption = caption
+        self.screen = None
+        self.scaled = False
+
+    @property
+    def logical_size(self):
+        return parse_resolution(self.settings.current_settings.get("render_resolution"))
+
+    @property
+    def window_size(self):
+        """The "resolution" setting, shrunk to fit the desktop if needed,
+        e.g. the shipped 1920x1080 on a 1080p or smaller screen."""
+        width, height = parse_resolution(self.settings.current_settings.get("resolution"), self.logical_size)
+        desktop = desktop_size()
+        if desktop is not None:
+            fit = min(desktop[0] * DESKTOP_FIT / width, desktop[1] * DESKTOP_FIT / height)
+            if fit < 1:
+                width, height = int(width * fit), int(height * fit)
+        return width, height
+
+    def apply(self):
+        """Sets the mode the settings ask for. Returns True when the
+        logical screen size changed and the scenes need laying out."""
+        old_size = self.screen.get_size() if self.screen is not None else None
+        size = self.logical_size
+        fullscreen = self.settings.current_settings['fullscreen']
+        flags = pygame.FULLSCREEN if fullscreen else 0
+
+        self.scaled = fullscreen or self.window_size != size
+        if self.scaled:
+            try:
+                self.screen = pygame.display.set_mode(size, flags | pygame.SCALED)
+            except pygame.error as e:
+                print(f"Scaled display not available: {e}")
+                self.scaled = False
+        if not self.scaled:
+            self.screen = pygame.display.set_mode(size, flags)
+        elif not fullscreen:
+            self.resize_window(self.window_size)
+
+        if self.caption:
+            pygame.display.set_caption(self.caption)
+        return old_size is not None and self.screen.get_size() != old_size
+
+    def resize_window(self, size):
+        # SCALED picks a whole-number zoom on its own; the window is then
+        # set to the requested size and SDL letterboxes whatever is left.
+        try:
+            from pygame._sdl2.video import Window
+            window = Window.from_display_module()
+            if tuple(window.size) != tuple(size):
+                window.size = size
+        except (ImportError, pygame.error) as e:
+            print(f"Could not resize the window: {e}")
@@ -1,110 +1,161 @@
 import pygame
+import math
 import random
 from pygame import gfxdraw
 from menu import Button
+from cache import sprite_cache, blit_sprite, text_cache, get_font
+from audio import sound_bank
+from physics import BallSet, SpatialHash, predict_y
+from profiles import get_profile
+from scheduler import Scheduler
+from profiler import profiler
+from replay import Replay, LAST_MATCH_FILE
+from scenes import Scene
+from collections import namedtuple
+
+
+# Speeds are in pixels per second and rates per second, so the tick
+# rate only sets how finely the simulation is stepped.
+TICK_RATE = 120
+TICK = 1.0 / TICK_RATE
+# Batch runs have nobody watching, so they can take coarser steps; the
+# swept collisions keep fast balls from tunnelling at this rate.
+HEADLESS_TICK_RATE = 30
+FPS = 60
+MAX_FRAME_TIME = 0.25
+
+
+PADDLE_SPEED = 2500
+BALL_SPEED_INCREMENT = 50
+MIN_BALL_SPEED = 50
+# Score for a return, per px/s of ball speed.
+POINTS_PER_SPEED = 0.102
+# How often the AI picks a new aim error, in seconds.
+AIM_INTERVAL = 0.05
+
+
+SCORE_POPUP_TIME = 1.0
+
+
+ModifierEffect = namedtuple("ModifierEffect", ["duration", "stacking", "apply", "revert"])
+
+
+def grow_paddle(game):
+    game.paddle_left.rect.height = 180
+
+
+def restore_paddle(game):
+    game.paddle_left.rect.height = 120
+
+
+def slow_ball(game):
+    game.ball.current_speed = max(MIN_BALL_SPEED, game.ball.current_speed * 0.3)
+
+
+def restore_ball_speed(game):
+    game.ball.current_speed = game.ball.base_speed
+
+
+def add_extra_ball(game):
+    # There is only ever one extra ball; picking the modifier up again
+    # serves a fresh one from the middle in place of the old.
+    remove_extra_balls(game)
+    game.extra_balls.append(game.add_ball((255, 0, 0)))
+
+
+def remove_extra_balls(game):
+    for ball in game.extra_balls:
+        game.balls.remove(ball)
+    game.extra_balls = []
+
+
+# Picking up a modifier that is already active either restarts its
+# timer ("refresh") or adds its duration to what is left ("extend").
+MODIFIER_EFFECTS = {
+    "paddle_size": ModifierEffect(20, "refresh", grow_paddle, restore_paddle),
+    "ball_speed": ModifierEffect(10, "refresh", slow_ball, restore_ball_speed),
+    "extra_ball": ModifierEffect(5, "refresh", add_extra_ball, remove_extra_balls),
+}
+
+
+def track_ball(game):
+    return game.ball.rect.centery, False, False
 
 class Paddle:
-    def __init__(self, x, y, width, height, is_ai=False, ai_difficulty="medium"):
+    def __init__(self, x, y, width, height, is_ai=False, ai_difficulty="medium", screen_height=None,
+                 rng=None):
         self.rect = pygame.Rect(x, y, width, height)
-        self.speed = 5
+        self.random = rng or random
+        self.speed = PADDLE_SPEED
         self.score = 0
         self.alive = True
         self.is_ai = is_ai
         self.ai_difficulty = ai_difficulty
+        self.profile = get_profile(ai_difficulty)
         self.target_y = y
         self.position_y = float(y)
         self.prediction_offset = 0
+        self.aim_offset = 0
+        self.aim_timer = 0.0
+        self.predictions = {}
         self.velocity = 0  
-        self.smoothing = 0.92  
-        self.screen_height = pygame.display.get_surface().get_height()
-        
-    def move(self, up=True):
+        self.smoothing = self.profile.smoothing
+        if screen_height is None:
+            screen_height = pygame.display.get_surface().get_height()
+        self.screen_height = screen_height
+        self.previous_y = y
+        
+    def store_previous(self):
+        self.previous_y = self.rect.y
+
+    def interpolated_rect(self, alpha):
+        rect = self.rect.copy()
+        rect.y = round(self.previous_y + (self.rect.y - self.previous_y) * alpha)
+        return rect
+
+    def move(self, up=True, dt=TICK):
+        step = round(self.speed * dt)
         if up and self.rect.top > 0:
-            self.rect.y -= self.speed
+            self.rect.y = max(0, self.rect.y - step)
         if not up and self.rect.bottom < self.screen_height:
-            self.rect.y += self.speed
+            self.rect.y = min(self.screen_height - self.rect.height, self.rect.y + step)
     
-    def move_to_mouse(self, target_y):
+    def move_to_mouse(self, target_y, dt=TICK):
         self.target_y = target_y - self.rect.height / 2
         self.target_y = max(0, min(self.target_y, self.screen_height - self.rect.height))
         diff = self.target_y - self.rect.y
-        if abs(diff) > self.speed:
-            self.rect.y += self.speed * (1 if diff > 0 else -1)
+        step = round(self.speed * dt)
+        if abs(diff) > step:
+            self.rect.y += step * (1 if diff > 0 else -1)
         else:
             self.rect.y = self.target_y
 
-    def ai_move(self, ball, extra_ball=None):
+    def ai_move(self, balls, dt=TICK):
         if not self.is_ai or not self.alive:
             return
             
         
-        self.screen_height = pygame.display.get_surface().get_height()
-            
+        profile = self.profile
         
-        if self.ai_difficulty == "easy":
-            reaction_speed = 0.008  
-            prediction_noise = 100  
-            max_speed = 2.5
-            self.smoothing = 0.985  
-            prediction_smoothing = 0.03  
-            acceleration_factor = 0.3  
-        elif self.ai_difficulty == "medium":
-            reaction_speed = 0.025  
-            prediction_noise = 50  
-            max_speed = 3.5
-            self.smoothing = 0.95  
-            prediction_smoothing = 0.08  
-            acceleration_factor = 0.5  
-        else:  
-            reaction_speed = 0.04  
-            prediction_noise = 25  
-            max_speed = 4.5
-            self.smoothing = 0.92  
-            prediction_smoothing = 0.12  
-            acceleration_factor = 0.7  
-            
-        
-        target_offset = random.uniform(-prediction_noise, prediction_noise)
-        self.prediction_offset += (target_offset - self.prediction_offset) * prediction_smoothing
+        # The aim error changes AIM_INTERVAL times a second whatever the
+        # tick rate, and prediction_offset eases towards it.
+        self.aim_timer -= dt
+        if self.aim_timer <= 0:
+            self.aim_offset = self.random.uniform(-profile.prediction_noise, profile.prediction_noise)
+            self.aim_timer += AIM_INTERVAL
+        ease = 1 - math.exp(-profile.prediction_smoothing * dt)
+        self.prediction_offset += (self.aim_offset - self.prediction_offset) * ease
         
         
-        target_ball = ball
-        if extra_ball:
-            
-            main_ball_moving_toward = ball.speed_x > 0  
-            extra_ball_moving_toward = extra_ball.speed_x > 0  
-            
-            if main_ball_moving_toward and extra_ball_moving_toward:
-                
-                dist_to_main = abs(self.rect.centerx - ball.rect.centerx)
-                dist_to_extra = abs(self.rect.centerx - extra_ball.rect.centerx)
-                if dist_to_extra < dist_to_main:
-                    target_ball = extra_ball
-            elif extra_ball_moving_toward and not main_ball_moving_toward:
-                
-                target_ball = extra_ball
-            elif not main_ball_moving_toward and not extra_ball_moving_toward:
-                
-                dist_to_main = abs(self.rect.centerx - ball.rect.centerx)
-                dist_to_extra = abs(self.rect.centerx - extra_ball.rect.centerx)
-                if dist_to_extra < dist_to_main:
-                    target_ball = extra_ball
+        target_ball = self.choose_target(balls)
+        if target_ball is None:
+            return
         
         
-        if self.ai_difficulty == "hard":
-            
-            
-            if target_ball.speed_x != 0:  
-                time_to_paddle = (self.rect.centerx - target_ball.rect.centerx) / target_ball.speed_x
-                if time_to_paddle > 0:  
-                    
-                    predicted_y = target_ball.rect.centery + (target_ball.speed_y * time_to_paddle)
-                    
-                    predicted_y += random.uniform(-prediction_noise, prediction_noise)
-                    self.target_y = predicted_y
-                else:
-                    
-                    self.target_y = target_ball.rect.centery + self.prediction_offset
+        if profile.predict_trajectory:
+            predicted_y = self.predict(target_ball, profile.prediction_noise)
+            if predicted_y is not None:
+                self.target_y = predicted_y
             else:
                 self.target_y = target_ball.rect.centery + self.prediction_offset
         else:
@@ -124,17 +175,18 @@ class Paddle:
             distance_factor = min(1.0, abs(diff) / 100)
             
             
-            desired_velocity = diff * reaction_speed * (0.3 + 0.7 * distance_factor) * acceleration_factor
+            desired_velocity = diff * profile.reaction_speed * (0.3 + 0.7 * distance_factor) * profile.acceleration_factor
             
             
-            self.velocity = (self.velocity * self.smoothing + 
-                           desired_velocity * (1 - self.smoothing))
+            keep = math.exp(-self.smoothing * dt)
+            self.velocity = (self.velocity * keep + 
+                           desired_velocity * (1 - keep))
             
             
-            self.velocity = max(min(self.velocity, max_speed), -max_speed)
+            self.velocity = max(min(self.velocity, profile.max_speed), -profile.max_speed)
             
             
-            self.position_y += self.velocity
+            self.position_y += self.velocity * dt
             
             
             self.position_y = max(0, min(self.position_y, self.screen_height - self.rect.height))
@@ -142,116 +194,151 @@ class Paddle:
         
         self.rect.y = round(self.position_y)
             
-    def draw(self, screen, antialiasing_enabled=True):
-        color = (255, 255, 255) if self.alive else (100, 100, 100)
-        
-        if antialiasing_enabled:
-            
-            
-            pygame.draw.rect(screen, color, self.rect, border_radius=8)
-            
-            
-            radius = 8
-            for i in range(radius):
-                alpha = int(255 * (1 - i/radius))
-                edge_color = (*color, alpha)
-                
-                
-                edge_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-                
-                
-                pygame.draw.rect(edge_surface, edge_color, 
-                               (0, 0, self.rect.width, self.rect.height), 
-                               border_radius=radius-i)
-                
-                
-                screen.blit(edge_surface, self.rect)
+    def choose_target(self, balls):
+        """The nearest ball heading toward this paddle, or the nearest ball
+        when none is."""
+        best = None
+        best_key = None
+        for ball in balls:
+            moving_toward = (ball.speed_x > 0) == (self.rect.centerx > ball.rect.centerx)
+            key = (not moving_toward, abs(self.rect.centerx - ball.rect.centerx))
+            if best_key is None or key < best_key:
+                best, best_key = ball, key
+        return best
+
+    def predict(self, ball, prediction_noise):
+        """Where ball's center will meet this paddle's face, plus noise.
+
+        The prediction only changes when the ball's velocity does, so it
+        is kept per ball until a bounce, modifier or reset changes it.
+        """
+        key = (ball.speed_x, ball.speed_y, self.screen_height)
+        cached = self.predictions.get(ball)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        if ball.speed_x > 0:
+            target_x = self.rect.left - ball.size
         else:
-            
-            pygame.draw.rect(screen, color, self.rect)
+            target_x = self.rect.right
+        predicted_y = predict_y(ball.position_x, ball.position_y, ball.speed_x, ball.speed_y,
+                                ball.size, target_x, self.screen_height)
+        if predicted_y is not None:
+            predicted_y += ball.size / 2 + self.random.uniform(-prediction_noise, prediction_noise)
+        
+        if len(self.predictions) > 8:
+            self.predictions.clear()
+        self.predictions[ball] = (key, predicted_y)
+        return predicted_y
+            
+    def draw(self, screen, antialiasing_enabled=True, alpha=1.0):
+        color = (255, 255, 255) if self.alive else (100, 100, 100)
+        rect = self.interpolated_rect(alpha)
+        sprite = sprite_cache.paddle(rect.size, color, self.alive, antialiasing_enabled)
+        return blit_sprite(screen, sprite, rect)
 
 class Ball:
-    def __init__(self, x, y, size, max_speed=None, difficulty="medium"):
+    def __init__(self, x, y, size, max_speed=None, difficulty="medium", ball_set=None, rng=None):
         self.rect = pygame.Rect(x, y, size, size)
+        self.random = rng or random
+        self.size = size
+        if ball_set is None:
+            ball_set = BallSet()
+        ball_set.add(self, float(x), float(y), size)
         
-        if difficulty == "easy":
-            self.base_speed = 0.1
-        elif difficulty == "medium":
-            self.base_speed = 0.5
-        else:  
-            self.base_speed = 1.5
-        self.speed_increment = 0.1
+        self.base_speed = get_profile(difficulty).ball_speed
+        self.speed_increment = BALL_SPEED_INCREMENT
         self.current_speed = self.base_speed
-        self.position_x = float(x)
-        self.position_y = float(y)
         self.left_hit_count = 0  
         self.right_hit_count = 0  
         self.max_speed = max_speed  
         self.difficulty = difficulty  
         self.color = (255, 255, 255)  
         self.reset_ball()
-        self.size = size
-        self.last_collision_time = 0  
+        self.store_previous()
         
+    @property
+    def position_x(self):
+        return self.ball_set.x[self.slot]
+
+    @position_x.setter
+    def position_x(self, value):
+        self.ball_set.x[self.slot] = value
+
+    @property
+    def position_y(self):
+        return self.ball_set.y[self.slot]
+
+    @position_y.setter
+    def position_y(self, value):
+        self.ball_set.y[self.slot] = value
+
+    @property
+    def speed_x(self):
+        return self.ball_set.speed_x[self.slot]
+
+    @speed_x.setter
+    def speed_x(self, value):
+        self.ball_set.speed_x[self.slot] = value
+
+    @property
+    def speed_y(self):
+        return self.ball_set.speed_y[self.slot]
+
+    @speed_y.setter
+    def speed_y(self, value):
+        self.ball_set.speed_y[self.slot] = value
+
+    @property
+    def previous_x(self):
+        return self.ball_set.previous_x[self.slot]
+
+    @property
+    def previous_y(self):
+        return self.ball_set.previous_y[self.slot]
+
+    def store_previous(self):
+        self.ball_set.previous_x[self.slot] = self.position_x
+        self.ball_set.previous_y[self.slot] = self.position_y
+
+    def interpolated_rect(self, alpha):
+        rect = self.rect.copy()
+        rect.x = round(self.previous_x + (self.position_x - self.previous_x) * alpha)
+        rect.y = round(self.previous_y + (self.position_y - self.previous_y) * alpha)
+        return rect
+
     def reset_ball(self):
         self.current_speed = self.base_speed
         self.position_x = float(self.rect.x)
         self.position_y = float(self.rect.y)
         self.left_hit_count = 0  
         self.right_hit_count = 0  
-        direction_x = random.choice((1, -1))
+        direction_x = self.random.choice((1, -1))
         
-        direction_y = random.uniform(-0.2, 0.2)
+        direction_y = self.random.uniform(-0.2, 0.2)
         self.speed_x = self.current_speed * direction_x
         self.speed_y = self.current_speed * direction_y
         
-    def move(self):
+    def move(self, dt=TICK):
         
-        self.position_x += self.speed_x
-        self.position_y += self.speed_y
+        self.position_x += self.speed_x * dt
+        self.position_y += self.speed_y * dt
         
         
         self.rect.x = round(self.position_x)
         self.rect.y = round(self.position_y)
         
-    def draw(self, screen, antialiasing_enabled=True):
-        if antialiasing_enabled:
-            
-            radius = self.size // 2
-            
-            
-            circle_surface = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-            
-            
-            pygame.draw.circle(circle_surface, (*self.color, 255), 
-                             (radius, radius), radius)
-            
-            
-            for i in range(3):
-                edge_radius = radius - i
-                alpha = int(255 * (1 - i/3))
-                pygame.draw.circle(circle_surface, (*self.color, alpha), 
-                                 (radius, radius), edge_radius)
-            
-            
-            screen.blit(circle_surface, self.rect)
-        else:
-            
-            pygame.draw.circle(screen, self.color, 
-                             (self.rect.centerx, self.rect.centery), self.size // 2)
+    def draw(self, screen, antialiasing_enabled=True, alpha=1.0):
+        rect = self.interpolated_rect(alpha)
+        sprite = sprite_cache.ball(self.size, self.color, antialiasing_enabled)
+        return blit_sprite(screen, sprite, rect)
         
     def bounce(self):
         self.speed_y *= -1
         
     def bounce_paddle(self, is_left_paddle=True):
         
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_collision_time < 100:  
-            return
-            
-        self.last_collision_time = current_time
-        
-        self.speed_x *= -1
+        self.speed_x = abs(self.speed_x) if is_left_paddle else -abs(self.speed_x)
         
         if is_left_paddle:
             self.left_hit_count += 1
@@ -271,12 +358,6 @@ class Ball:
         if total_speed > 0:  
             self.speed_x = (self.speed_x / total_speed) * self.current_speed
             self.speed_y = (self.speed_y / total_speed) * self.current_speed
-            
-        
-        if self.speed_x > 0:
-            self.position_x = self.rect.right + 5
-        else:
-            self.position_x = self.rect.left - 5
 
 class GameModifier:
     def __init__(self, x, y, modifier_type):
@@ -296,434 +377,551 @@ class GameModifier:
         
     def draw(self, screen, antialiasing_enabled=True):
         if antialiasing_enabled:
-            
-            circle_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-            pygame.draw.circle(circle_surface, (*self.color, 255), 
-                             (self.rect.width//2, self.rect.height//2), self.rect.width//2)
-            screen.blit(circle_surface, self.rect)
+            return blit_sprite(screen, sprite_cache.disc(self.rect.width, self.color), self.rect)
         else:
-            pygame.draw.circle(screen, self.color, 
+            return pygame.draw.circle(screen, self.color, 
                              (self.rect.centerx, self.rect.centery), self.rect.width//2)
 
-class Game:
-    def __init__(self, screen, ai_difficulty="medium"):
+class Game(Scene):
+    def __init__(self, screen, ai_difficulty="medium", headless=False, size=(960, 540), ball_count=1,
+                 max_modifiers=2, seed=None, record=None, tick_rate=TICK_RATE):
         self.screen = screen
-        self.width = screen.get_width()
-        self.height = screen.get_height()
-        
-        
-        if ai_difficulty == "easy":
-            self.max_ball_speed = 2.5
-        elif ai_difficulty == "medium":
-            self.max_ball_speed = 5.0
-        else:  
-            self.max_ball_speed = None  
-        
-        
-        self.paddle_left = Paddle(20, self.height//2 - 60, 20, 120, is_ai=False)
-        self.paddle_right = Paddle(self.width - 40, self.height//2 - 60, 20, 120, 
-                                 is_ai=True, ai_difficulty=ai_difficulty)
-        self.ball = Ball(self.width//2 - 15, self.height//2 - 15, 30, 
-                        max_speed=self.max_ball_speed, difficulty=ai_difficulty)
+        self.headless = headless
+        self.tick_rate = tick_rate
+        self.tick = 1.0 / tick_rate
+        if headless:
+            self.width, self.height = size
+        else:
+            self.width = screen.get_width()
+            self.height = screen.get_height()
         
         
-        self.game_over = False
-        self.winner = None
-        pygame.mouse.set_visible(False)
+        self.set_difficulty(ai_difficulty)
+        self.ball_count = ball_count
+        self.max_modifiers = max_modifiers
+        self.record = not headless if record is None else record
         
         
-        try:
-            self.paddle_sound = pygame.mixer.Sound('assets/paddle_hit.wav')
-            self.score_sound = pygame.mixer.Sound('assets/score.wav')
-            self.lose_sound = pygame.mixer.Sound('assets/lose.wav')
+        self.paddle_sound = None
+        self.score_sound = None
+        self.lose_sound = None
+        self.powerup_sound = None
+        self.slowdown_sound = None
+        if not headless:
+            self.paddle_sound = sound_bank.get('assets/paddle_hit.wav')
+            self.score_sound = sound_bank.get('assets/score.wav')
+            self.lose_sound = sound_bank.get('assets/lose.wav')
             
-            self.powerup_sound = pygame.mixer.Sound('assets/powerup.wav')
-            self.slowdown_sound = pygame.mixer.Sound('assets/slowdown.wav')
-        except:
-            print("Sound files not found")
+            self.powerup_sound = sound_bank.get('assets/powerup.wav')
+            self.slowdown_sound = sound_bank.get('assets/slowdown.wav')
             
         
-        self.font = pygame.font.Font(None, 74)
-        self.game_over_font = pygame.font.Font(None, 90)
-        self.instruction_font = pygame.font.Font(None, 36)
-        
-        self.last_score = 0  
-        self.total_score = 0  
-        self.score_popup_timer = 0  
-        
+        if headless:
+            self.font = None
+            self.game_over_font = None
+            self.instruction_font = None
+        else:
+            self.font = get_font(74)
+            self.game_over_font = get_font(90)
+            self.instruction_font = get_font(36)
+        self.profiler_font = get_font(22) if not headless else None
         
-        from menu import Settings
-        self.settings = Settings()
+        if headless:
+            self.settings = None
+        else:
+            from menu import get_settings
+            self.settings = get_settings()
         
         
+        self.clock = pygame.time.Clock()
+        self.accumulator = 0.0
+        self.full_redraw = True
+        self.drawn_rects = []
+        self.dirty_rects = []
+        self.start_match(seed)
+
+    def set_difficulty(self, ai_difficulty):
         self.ai_difficulty = ai_difficulty
-        
-        
-        self.modifiers = []
-        self.active_modifiers = {
-            "paddle_size": {"active": False, "timer": 0, "duration": 20},  
-            "ball_speed": {"active": False, "timer": 0, "duration": 10},   
-            "extra_ball": {"active": False, "timer": 0, "duration": 5}     
-        }
-        self.extra_ball = None
-        self.modifier_spawn_timer = 0
-        self.modifier_spawn_interval = random.uniform(5, 7)  
-        self.last_time = pygame.time.get_ticks()  
+        self.max_ball_speed = get_profile(ai_difficulty).max_ball_speed
 
     def reset_game(self):
         
-        self.width = self.screen.get_width()
-        self.height = self.screen.get_height()
-        
-        
-        self.paddle_left = Paddle(20, self.height//2 - 60, 20, 120, is_ai=False)
+        if not self.headless:
+            self.width = self.screen.get_width()
+            self.height = self.screen.get_height()
+        self.start_match()
+        self.full_redraw = True
+
+    def start_match(self, seed=None):
+        # Everything random in a match comes from this generator, so the
+        # seed and the player's inputs are enough to replay it.
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        self.random = random.Random(seed)
+        
+        self.paddle_left = Paddle(20, self.height//2 - 60, 20, 120, is_ai=False,
+                                  screen_height=self.height, rng=self.random)
         self.paddle_right = Paddle(self.width - 40, self.height//2 - 60, 20, 120, 
-                                 is_ai=True, ai_difficulty=self.ai_difficulty)
-        
-        self.paddle_left.alive = True
-        self.paddle_right.alive = True
-        self.paddle_left.score = 0
-        self.paddle_right.score = 0
+                                 is_ai=True, ai_difficulty=self.ai_difficulty, screen_height=self.height,
+                                 rng=self.random)
         self.total_score = 0  
         self.last_score = 0
-        self.score_popup_timer = 0
-        self.ball = Ball(self.width//2 - 15, self.height//2 - 15, 30, 
-                        max_speed=self.max_ball_speed, difficulty=self.ai_difficulty)
+        self.reset_balls()
+        
+        self.modifiers = []
+        self.modifier_index = SpatialHash()
+        self.active_effects = {}
+        self.score_popup = None
+        self.scheduler = Scheduler()
+        self.schedule_spawn()
+        self.sim_ticks = 0
+        self.sim_time = 0.0
+        
+        self.replay = None
+        if self.record:
+            self.replay = Replay(seed, self.ai_difficulty, (self.width, self.height), self.tick_rate,
+                                 self.ball_count, self.max_modifiers)
         self.game_over = False
         self.winner = None
-        pygame.mouse.set_visible(False)  
+        self.set_mouse_visible(False)
+
+    def save_replay(self, path=LAST_MATCH_FILE):
+        if self.replay is None:
+            return
+        self.replay.finish(self)
+        try:
+            self.replay.save(path)
+        except OSError as e:
+            print(f"Error saving replay: {e}")
+
+    def reset_balls(self):
+        self.balls = BallSet()
+        self.ball = self.add_ball()
+        for _ in range(self.ball_count - 1):
+            self.add_ball()
+        self.extra_balls = []
+
+    def add_ball(self, color=(255, 255, 255)):
+        ball = Ball(self.width//2 - 15, self.height//2 - 15, 30,
+                    max_speed=self.max_ball_speed, difficulty=self.ai_difficulty,
+                    ball_set=self.balls, rng=self.random)
+        ball.color = color
+        return ball
+
+    def set_mouse_visible(self, visible):
+        if not self.headless:
+            pygame.mouse.set_visible(visible)
+
+    def play_sound(self, sound):
+        if sound is None:
+            return
+        try:
+            sound.play()
+        except:
+            pass
 
     def spawn_modifier(self):
-        if len(self.modifiers) < 2:  
-            x = random.randint(50, self.width - 50)
-            y = random.randint(50, self.height - 50)
-            modifier_type = random.choice(["paddle_size", "ball_speed", "extra_ball"])
-            self.modifiers.append(GameModifier(x, y, modifier_type))
+        if len(self.modifiers) < self.max_modifiers:  
+            x = self.random.randint(50, self.width - 50)
+            y = self.random.randint(50, self.height - 50)
+            modifier_type = self.random.choice(["paddle_size", "ball_speed", "extra_ball"])
+            modifier = GameModifier(x, y, modifier_type)
+            self.modifiers.append(modifier)
+            self.modifier_index.insert(modifier, modifier.rect)
+            
+    def schedule_spawn(self):
+        self.scheduler.schedule(self.random.uniform(5, 7), self.spawn_and_reschedule)
+
+    def spawn_and_reschedule(self):
+        self.spawn_modifier()
+        self.schedule_spawn()
+
+    def expire_effect(self, modifier_type):
+        del self.active_effects[modifier_type]
+        MODIFIER_EFFECTS[modifier_type].revert(self)
+
+    def check_modifier_collisions(self):
+        
+        if not self.modifiers:
+            return
+        # Picking up the extra ball modifier adds and removes balls, so the
+        # pickups are applied once the loop over the balls is done.
+        picked_up = []
+        for ball in self.balls:
+            for modifier in self.modifier_index.query(ball.rect):
+                self.modifiers.remove(modifier)
+                self.modifier_index.remove(modifier)
+                
+                if ball is self.ball:
+                    picked_up.append(modifier)
+                    
+        for modifier in picked_up:
+            self.apply_modifier(modifier)
+            if modifier.type in ["paddle_size", "ball_speed"]:
+                self.play_sound(self.powerup_sound)
+            else:
+                self.play_sound(self.slowdown_sound)
+            
+    def apply_modifier(self, modifier):
+        effect = MODIFIER_EFFECTS[modifier.type]
+        timer = self.active_effects.get(modifier.type)
+        if timer is None:
+            timer = self.scheduler.schedule(effect.duration, self.expire_effect, modifier.type)
+            self.active_effects[modifier.type] = timer
+        elif effect.stacking == "extend":
+            self.scheduler.extend(timer, effect.duration)
+        else:
+            self.scheduler.reschedule(timer, effect.duration)
+        effect.apply(self)
             
-    def handle_modifiers(self):
+            
+    def step(self, mouse_y, move_up=False, move_down=False):
+        
+        mouse_y = int(mouse_y)
+        if self.replay is not None:
+            self.replay.record(mouse_y, move_up, move_down)
+        self.sim_ticks += 1
+        self.sim_time = self.sim_ticks * self.tick
+        
+        self.paddle_left.store_previous()
+        self.paddle_right.store_previous()
+        self.balls.store_previous()
+        
+        self.paddle_left.move_to_mouse(mouse_y, self.tick)
         
-        current_time = pygame.time.get_ticks()
-        delta_time = (current_time - self.last_time) / 1000.0  
-        self.last_time = current_time
         
+        if move_up and self.paddle_left.alive:
+            self.paddle_left.move(True, self.tick)
+        if move_down and self.paddle_left.alive:
+            self.paddle_left.move(False, self.tick)
         
-        self.modifier_spawn_timer += delta_time
-        if self.modifier_spawn_timer >= self.modifier_spawn_interval:
-            self.spawn_modifier()
-            self.modifier_spawn_timer = 0
+        
+        start = profiler.begin()
+        self.paddle_right.ai_move(self.balls, self.tick)
+        profiler.end("ai", start)
             
-            self.modifier_spawn_interval = random.uniform(5, 7)
+        
+        start = profiler.begin()
+        for ball, paddle in self.balls.move(self.paddle_left, self.paddle_right, self.height, self.tick):
+            if ball is self.ball and paddle is self.paddle_left:
+                points = int(self.ball.current_speed * POINTS_PER_SPEED)
+                self.paddle_left.score += 1
+                self.total_score += points
+                self.last_score = points
+                self.scheduler.cancel(self.score_popup)
+                self.score_popup = self.scheduler.schedule(SCORE_POPUP_TIME, self.hide_score_popup)
+            elif ball is self.ball:
+                self.paddle_right.score += 1
+            self.play_sound(self.paddle_sound)
             
         
-        for modifier_type, data in self.active_modifiers.items():
-            if data["active"]:
-                data["timer"] -= delta_time
-                if data["timer"] <= 0:
-                    data["active"] = False
+        for ball in self.balls:
+            if ball.rect.left <= 0:
+                self.paddle_left.alive = False
+                self.game_over = True
+                self.winner = "AI"
+                self.set_mouse_visible(True)
+                self.play_sound(self.lose_sound)
                     
-                    if modifier_type == "paddle_size":
-                        self.paddle_left.rect.height = 120  
-                    elif modifier_type == "ball_speed":
-                        self.ball.current_speed = self.ball.base_speed
-                    elif modifier_type == "extra_ball":
-                        self.extra_ball = None
-                        
-    def check_modifier_collisions(self):
+            if ball.rect.right >= self.width:
+                self.paddle_right.alive = False
+                self.game_over = True
+                self.winner = "Player"
+                self.set_mouse_visible(True)
+                self.play_sound(self.lose_sound)
+        profiler.end("physics", start)
+
         
-        for modifier in self.modifiers[:]:
-            if self.ball.rect.colliderect(modifier.rect):
-                self.apply_modifier(modifier)
-                self.modifiers.remove(modifier)
-                try:
-                    if modifier.type in ["paddle_size", "ball_speed"]:
-                        self.powerup_sound.play()
-                    else:
-                        self.slowdown_sound.play()
-                except:
-                    pass
-                    
+        start = profiler.begin()
+        self.scheduler.advance(self.sim_time)
+        self.check_modifier_collisions()
+        profiler.end("modifiers", start)
+
+    def hide_score_popup(self):
+        self.score_popup = None
+
+    def simulate(self, controller=track_ball, max_ticks=None):
+        ticks = 0
+        while not self.game_over and (max_ticks is None or ticks < max_ticks):
+            mouse_y, move_up, move_down = controller(self)
+            self.step(mouse_y, move_up, move_down)
+            ticks += 1
+        return ticks
+
+    def blit(self, surface, rect):
+        self.drawn_rects.append(self.screen.blit(surface, rect))
+
+    def draw(self, alpha=1.0):
+        """Draws the frame and returns the screen rects that changed.
+
+        Only the areas drawn last frame are cleared, everything is drawn
+        again on top, and the changed rects are the old areas plus the new
+        ones. A full clear happens when full_redraw is set.
+        """
+        if self.full_redraw:
+            self.screen.fill((0, 0, 0))
+        else:
+            for rect in self.drawn_rects:
+                self.screen.fill((0, 0, 0), rect)
+        previous_rects = self.drawn_rects
+        self.drawn_rects = []
+        drawn = self.drawn_rects
         
-        if self.extra_ball:
-            for modifier in self.modifiers[:]:
-                if self.extra_ball.rect.colliderect(modifier.rect):
-                    self.modifiers.remove(modifier)
-            
-    def apply_modifier(self, modifier):
-        if modifier.type == "paddle_size":
-            self.active_modifiers["paddle_size"]["active"] = True
-            self.active_modifiers["paddle_size"]["timer"] = self.active_modifiers["paddle_size"]["duration"]
-            self.paddle_left.rect.height = 180  
-        elif modifier.type == "ball_speed":
-            self.active_modifiers["ball_speed"]["active"] = True
-            self.active_modifiers["ball_speed"]["timer"] = self.active_modifiers["ball_speed"]["duration"]
-            
-            new_speed = max(0.1, self.ball.current_speed * 0.3)
-            self.ball.current_speed = new_speed
-        elif modifier.type == "extra_ball":
-            self.active_modifiers["extra_ball"]["active"] = True
-            self.active_modifiers["extra_ball"]["timer"] = self.active_modifiers["extra_ball"]["duration"]
-            self.extra_ball = Ball(self.width//2 - 15, self.height//2 - 15, 30, 
-                                 max_speed=self.max_ball_speed, difficulty=self.ai_difficulty)
-            self.extra_ball.color = (255, 0, 0)  
-            
-    def run(self):
-        while True:
-            
-            self.width = self.screen.get_width()
-            self.height = self.screen.get_height()
+        antialiasing_enabled = self.settings.current_settings['antialiasing_enabled']
+        
+        
+        drawn.append(self.paddle_left.draw(self.screen, antialiasing_enabled, alpha))
+        drawn.append(self.paddle_right.draw(self.screen, antialiasing_enabled, alpha))
+        for ball in self.balls:
+            drawn.append(ball.draw(self.screen, antialiasing_enabled, alpha))
+        
+        hud_start = profiler.begin()
             
-            self.screen.fill((0, 0, 0))
+        score_left = text_cache.render(self.font, str(self.paddle_left.score), True, (255, 255, 255))
+        score_right = text_cache.render(self.font, str(self.paddle_right.score), True, (255, 255, 255))
+        
+        
+        score_left_rect = score_left.get_rect(centerx=self.width//4, top=20)
+        score_right_rect = score_right.get_rect(centerx=3*self.width//4, top=20)
+        
+        self.blit(score_left, score_left_rect)
+        self.blit(score_right, score_right_rect)
+        
+        
+        speed_text = text_cache.render(self.instruction_font,
+            f"Ball Speed: {self.ball.current_speed:.0f}", True, (255, 255, 255))
+        speed_rect = speed_text.get_rect(centerx=self.width//2, top=20)
+        self.blit(speed_text, speed_rect)
+        
+        
+        if self.max_ball_speed is not None:
+            max_speed_text = text_cache.render(self.instruction_font,
+                f"Max Speed: {self.max_ball_speed:.0f}", True, (200, 200, 200))
+            max_speed_rect = max_speed_text.get_rect(centerx=self.width//2, top=50)
+            self.blit(max_speed_text, max_speed_rect)
+        
+        
+        total_score_text = text_cache.render(self.instruction_font,
+            f"Total Score: {self.total_score}", True, (255, 255, 255))
+        total_score_rect = total_score_text.get_rect(
+            centerx=self.width//2,
+            bottom=self.height - 20
+        )
+        self.blit(total_score_text, total_score_rect)
+        
+        
+        if self.score_popup is not None:
+            popup_color = (0, 255, 0)
+            score_popup = text_cache.render(self.instruction_font,
+                f"+{self.last_score}", True, popup_color)
+            popup_rect = score_popup.get_rect(
+                centerx=self.width//2,
+                centery=self.height//2 - 50
+            )
             
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "quit"
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        pygame.mouse.set_visible(False)  
-                        return "menu"
-                    if event.key == pygame.K_SPACE and self.game_over:
-                        self.reset_game()
-                    if event.key == pygame.K_m and self.game_over:
-                        pygame.mouse.set_visible(False)  
-                        return "menu"
-                    if event.key == pygame.K_t and self.game_over and self.winner == "Player":
-                        pygame.mouse.set_visible(False)  
-                        return f"scores:{self.total_score}"  
-            
-            if not self.game_over:
-                
-                mouse_y = pygame.mouse.get_pos()[1]
-                self.paddle_left.move_to_mouse(mouse_y)
-                
-                
-                keys = pygame.key.get_pressed()
-                if keys[pygame.K_w] and self.paddle_left.alive:
-                    self.paddle_left.move(up=True)
-                if keys[pygame.K_s] and self.paddle_left.alive:
-                    self.paddle_left.move(up=False)
-                
+            popup_alpha = int(255 * (self.scheduler.remaining(self.score_popup) / SCORE_POPUP_TIME))
+            # The surface belongs to text_cache, so its alpha is put back
+            # once the popup is drawn.
+            cached_alpha = score_popup.get_alpha()
+            score_popup.set_alpha(popup_alpha)
+            self.blit(score_popup, popup_rect)
+            score_popup.set_alpha(cached_alpha)
+        
+        
+        if self.game_over:
+            if self.winner == "Player":
                 
-                self.paddle_right.ai_move(self.ball, self.extra_ball)
-                    
+                game_over_text = text_cache.render(self.game_over_font, "YOU WON!", True, (0, 255, 0))
+                final_score_text = text_cache.render(self.font, f"Final Score: {self.total_score}", True, (255, 255, 255))
+                restart_text = text_cache.render(self.instruction_font, "Press SPACE to play again", True, (255, 255, 255))
+                menu_text = text_cache.render(self.instruction_font, "Press M to return to menu", True, (255, 255, 255))
+                scores_text = text_cache.render(self.instruction_font, "Press T to view global scores", True, (255, 255, 255))
+                name_text = text_cache.render(self.instruction_font, "Enter your name in the scores menu", True, (255, 255, 255))
                 
-                self.ball.move()
                 
+                game_over_rect = game_over_text.get_rect(centerx=self.width//2, centery=self.height//2 - 120)
+                final_score_rect = final_score_text.get_rect(centerx=self.width//2, centery=self.height//2 - 30)
+                restart_rect = restart_text.get_rect(centerx=self.width//2, centery=self.height//2 + 30)
+                menu_rect = menu_text.get_rect(centerx=self.width//2, centery=self.height//2 + 90)
+                scores_rect = scores_text.get_rect(centerx=self.width//2, centery=self.height//2 + 150)
+                name_rect = name_text.get_rect(centerx=self.width//2, centery=self.height//2 + 210)
                 
-                if self.ball.rect.top <= 0 or self.ball.rect.bottom >= self.height:
-                    self.ball.bounce()
-                    
+                self.blit(game_over_text, game_over_rect)
+                self.blit(final_score_text, final_score_rect)
+                self.blit(restart_text, restart_rect)
+                self.blit(menu_text, menu_rect)
+                self.blit(scores_text, scores_rect)
+                self.blit(name_text, name_rect)
+            else:
                 
-                if self.ball.rect.colliderect(self.paddle_left.rect) and self.paddle_left.alive or \
-                   self.ball.rect.colliderect(self.paddle_right.rect) and self.paddle_right.alive:
-                    if self.ball.rect.colliderect(self.paddle_left.rect):
-                        self.ball.bounce_paddle(is_left_paddle=True)
-                        points = int((self.ball.current_speed * 102) / 2)
-                        self.paddle_left.score += 1
-                        self.total_score += points
-                        self.last_score = points
-                        self.score_popup_timer = 60  
-                    else:
-                        self.ball.bounce_paddle(is_left_paddle=False)
-                        self.paddle_right.score += 1
-                    try:
-                        self.paddle_sound.play()
-                    except:
-                        pass
-                    
+                game_over_text = text_cache.render(self.game_over_font, "GAME OVER", True, (255, 0, 0))
+                winner_text = text_cache.render(self.font, f"{self.winner} Wins!", True, (255, 255, 255))
+                final_score_text = text_cache.render(self.font, f"Final Score: {self.total_score}", True, (255, 255, 255))
+                restart_text = text_cache.render(self.instruction_font, "Press SPACE to restart", True, (255, 255, 255))
+                menu_text = text_cache.render(self.instruction_font, "Press M to go to main menu", True, (255, 255, 255))
                 
-                if self.ball.rect.left <= 0:
-                    self.paddle_left.alive = False
-                    self.game_over = True
-                    self.winner = "AI"
-                    pygame.mouse.set_visible(True)  
-                    try:
-                        self.lose_sound.play()
-                    except:
-                        pass
-                        
-                if self.ball.rect.right >= self.width:
-                    self.paddle_right.alive = False
-                    self.game_over = True
-                    self.winner = "Player"
-                    pygame.mouse.set_visible(True)  
-                    try:
-                        self.lose_sound.play()
-                    except:
-                        pass
                 
+                game_over_rect = game_over_text.get_rect(centerx=self.width//2, centery=self.height//2 - 120)
+                winner_rect = winner_text.get_rect(centerx=self.width//2, centery=self.height//2 - 30)
+                final_score_rect = final_score_text.get_rect(centerx=self.width//2, centery=self.height//2 + 30)
+                restart_rect = restart_text.get_rect(centerx=self.width//2, centery=self.height//2 + 100)
+                menu_rect = menu_text.get_rect(centerx=self.width//2, centery=self.height//2 + 160)
                 
-                if self.extra_ball:
-                    if self.extra_ball.rect.left <= 0:
-                        self.paddle_left.alive = False
-                        self.game_over = True
-                        self.winner = "AI"
-                        pygame.mouse.set_visible(True)  
-                        try:
-                            self.lose_sound.play()
-                        except:
-                            pass
-                            
-                    if self.extra_ball.rect.right >= self.width:
-                        self.paddle_right.alive = False
-                        self.game_over = True
-                        self.winner = "Player"
-                        pygame.mouse.set_visible(True)  
-                        try:
-                            self.lose_sound.play()
-                        except:
-                            pass
+                self.blit(game_over_text, game_over_rect)
+                self.blit(winner_text, winner_rect)
+                self.blit(final_score_text, final_score_rect)
+                self.blit(restart_text, restart_rect)
+                self.blit(menu_text, menu_rect)
+        
+        
+        if not self.game_over:
+            mouse_pos = pygame.mouse.get_pos()
+            
+            if antialiasing_enabled:
+                drawn.append(blit_sprite(self.screen, sprite_cache.disc(6, (100, 100, 100)),
+                                         (self.paddle_left.rect.right + 10 - 3, mouse_pos[1] - 3)))
+            else:
+                drawn.append(pygame.draw.circle(self.screen, (100, 100, 100), 
+                                                (self.paddle_left.rect.right + 10, mouse_pos[1]), 3))
+        
+        
+        for modifier in self.modifiers:
+            drawn.append(modifier.draw(self.screen, antialiasing_enabled))
+            
+        
+        y_offset = 80
+        for modifier_type, timer in self.active_effects.items():
+            color = (255, 0, 0) if modifier_type in ["paddle_size", "ball_speed"] else (255, 255, 0)
+            remaining = self.scheduler.remaining(timer)
+            text = text_cache.render(self.instruction_font,
+                f"{modifier_type.replace('_', ' ').title()}: {remaining:.1f}s", 
+                True, color)
+            text_rect = text.get_rect(centerx=self.width//2, top=y_offset)
+            self.blit(text, text_rect)
+            y_offset += 30
+        profiler.end("hud", hud_start)
+        
+        overlay_rect = profiler.draw_overlay(self.screen, self.profiler_font)
+        if overlay_rect is not None:
+            drawn.append(overlay_rect)
+        
+        if self.full_redraw:
+            self.full_redraw = False
+            return [self.screen.get_rect()]
+        return previous_rects + drawn
 
-                
-                self.handle_modifiers()
-                self.check_modifier_collisions()
-                
-                
-                if self.extra_ball:
-                    self.extra_ball.move()
-                    if self.extra_ball.rect.top <= 0 or self.extra_ball.rect.bottom >= self.height:
-                        self.extra_ball.bounce()
-                    if self.extra_ball.rect.colliderect(self.paddle_left.rect) and self.paddle_left.alive or \
-                       self.extra_ball.rect.colliderect(self.paddle_right.rect) and self.paddle_right.alive:
-                        if self.extra_ball.rect.colliderect(self.paddle_left.rect):
-                            self.extra_ball.bounce_paddle(is_left_paddle=True)
-                        else:
-                            self.extra_ball.bounce_paddle(is_left_paddle=False)
-                        try:
-                            self.paddle_sound.play()
-                        except:
-                            pass
+    def resize(self, width, height):
+        """Fits the match in progress to a new screen size, keeping the
+        paddles, balls and modifiers in the same relative places."""
+        if (width, height) == (self.width, self.height):
+            return
+        scale_x = width / self.width
+        scale_y = height / self.height
+        self.width = width
+        self.height = height
+        
+        self.paddle_right.rect.x = width - 40
+        for paddle in (self.paddle_left, self.paddle_right):
+            paddle.screen_height = height
+            paddle.rect.y = max(0, min(round(paddle.rect.y * scale_y), height - paddle.rect.height))
+            paddle.position_y = float(paddle.rect.y)
+            paddle.target_y = paddle.rect.y
+            paddle.predictions.clear()
+            paddle.store_previous()
+            
+        for ball in self.balls:
+            ball.position_x *= scale_x
+            ball.position_y *= scale_y
+            ball.rect.x = round(ball.position_x)
+            ball.rect.y = round(ball.position_y)
+            ball.store_previous()
+            
+        self.modifier_index.clear()
+        for modifier in self.modifiers:
+            modifier.rect.x = round(modifier.rect.x * scale_x)
+            modifier.rect.y = round(modifier.rect.y * scale_y)
+            self.modifier_index.insert(modifier, modifier.rect)
+        
+        # Replays play back at a single size, so a match that changed
+        # size part way through is not recorded.
+        self.replay = None
+        self.full_redraw = True
 
+    def enter(self, ai_difficulty=None):
+        """Call before the first frame(), and again when coming back to
+        the game after another screen has drawn over it. Passing
+        ai_difficulty starts a new match against that AI."""
+        if ai_difficulty is not None:
+            self.set_difficulty(ai_difficulty)
+            self.reset_game()
+        self.clock.tick()
+        self.accumulator = 0.0
+        self.full_redraw = True
+        self.dirty_rects = []
+
+    def run(self):
+        self.enter()
+        while True:
             
-            antialiasing_enabled = self.settings.current_settings['antialiasing_enabled']
-            
-            
-            self.paddle_left.draw(self.screen, antialiasing_enabled)
-            self.paddle_right.draw(self.screen, antialiasing_enabled)
-            self.ball.draw(self.screen, antialiasing_enabled)
-            
-            
-            score_left = self.font.render(str(self.paddle_left.score), True, (255, 255, 255))
-            score_right = self.font.render(str(self.paddle_right.score), True, (255, 255, 255))
-            
-            
-            score_left_rect = score_left.get_rect(centerx=self.width//4, top=20)
-            score_right_rect = score_right.get_rect(centerx=3*self.width//4, top=20)
-            
-            self.screen.blit(score_left, score_left_rect)
-            self.screen.blit(score_right, score_right_rect)
-            
-            
-            speed_text = self.instruction_font.render(
-                f"Ball Speed: {self.ball.current_speed:.1f}", True, (255, 255, 255))
-            speed_rect = speed_text.get_rect(centerx=self.width//2, top=20)
-            self.screen.blit(speed_text, speed_rect)
-            
-            
-            if self.max_ball_speed is not None:
-                max_speed_text = self.instruction_font.render(
-                    f"Max Speed: {self.max_ball_speed:.1f}", True, (200, 200, 200))
-                max_speed_rect = max_speed_text.get_rect(centerx=self.width//2, top=50)
-                self.screen.blit(max_speed_text, max_speed_rect)
-            
-            
-            total_score_text = self.instruction_font.render(
-                f"Total Score: {self.total_score}", True, (255, 255, 255))
-            total_score_rect = total_score_text.get_rect(
-                centerx=self.width//2,
-                bottom=self.height - 20
-            )
-            self.screen.blit(total_score_text, total_score_rect)
-            
-            
-            if self.score_popup_timer > 0:
-                popup_color = (0, 255, 0)
-                score_popup = self.instruction_font.render(
-                    f"+{self.last_score}", True, popup_color)
-                popup_rect = score_popup.get_rect(
-                    centerx=self.width//2,
-                    centery=self.height//2 - 50
-                )
-                
-                alpha = int(255 * (self.score_popup_timer / 60))
-                score_popup.set_alpha(alpha)
-                self.screen.blit(score_popup, popup_rect)
-                self.score_popup_timer -= 1
-            
-            
-            if self.game_over:
-                if self.winner == "Player":
-                    
-                    game_over_text = self.game_over_font.render("YOU WON!", True, (0, 255, 0))
-                    final_score_text = self.font.render(f"Final Score: {self.total_score}", True, (255, 255, 255))
-                    restart_text = self.instruction_font.render("Press SPACE to play again", True, (255, 255, 255))
-                    menu_text = self.instruction_font.render("Press M to return to menu", True, (255, 255, 255))
-                    scores_text = self.instruction_font.render("Press T to view global scores", True, (255, 255, 255))
-                    name_text = self.instruction_font.render("Enter your name in the scores menu", True, (255, 255, 255))
-                    
-                    
-                    game_over_rect = game_over_text.get_rect(centerx=self.width//2, centery=self.height//2 - 120)
-                    final_score_rect = final_score_text.get_rect(centerx=self.width//2, centery=self.height//2 - 30)
-                    restart_rect = restart_text.get_rect(centerx=self.width//2, centery=self.height//2 + 30)
-                    menu_rect = menu_text.get_rect(centerx=self.width//2, centery=self.height//2 + 90)
-                    scores_rect = scores_text.get_rect(centerx=self.width//2, centery=self.height//2 + 150)
-                    name_rect = name_text.get_rect(centerx=self.width//2, centery=self.height//2 + 210)
-                    
-                    self.screen.blit(game_over_text, game_over_rect)
-                    self.screen.blit(final_score_text, final_score_rect)
-                    self.screen.blit(restart_text, restart_rect)
-                    self.screen.blit(menu_text, menu_rect)
-                    self.screen.blit(scores_text, scores_rect)
-                    self.screen.blit(name_text, name_rect)
-                else:
-                    
-                    game_over_text = self.game_over_font.render("GAME OVER", True, (255, 0, 0))
-                    winner_text = self.font.render(f"{self.winner} Wins!", True, (255, 255, 255))
-                    final_score_text = self.font.render(f"Final Score: {self.total_score}", True, (255, 255, 255))
-                    restart_text = self.instruction_font.render("Press SPACE to restart", True, (255, 255, 255))
-                    menu_text = self.instruction_font.render("Press M to go to main menu", True, (255, 255, 255))
-                    
-                    
-                    game_over_rect = game_over_text.get_rect(centerx=self.width//2, centery=self.height//2 - 120)
-                    winner_rect = winner_text.get_rect(centerx=self.width//2, centery=self.height//2 - 30)
-                    final_score_rect = final_score_text.get_rect(centerx=self.width//2, centery=self.height//2 + 30)
-                    restart_rect = restart_text.get_rect(centerx=self.width//2, centery=self.height//2 + 100)
-                    menu_rect = menu_text.get_rect(centerx=self.width//2, centery=self.height//2 + 160)
-                    
-                    self.screen.blit(game_over_text, game_over_rect)
-                    self.screen.blit(winner_text, winner_rect)
-                    self.screen.blit(final_score_text, final_score_rect)
-                    self.screen.blit(restart_text, restart_rect)
-                    self.screen.blit(menu_text, menu_rect)
-            
-            
-            if not self.game_over:
-                mouse_pos = pygame.mouse.get_pos()
-                
-                if antialiasing_enabled:
-                    circle_surface = pygame.Surface((6, 6), pygame.SRCALPHA)
-                    pygame.draw.circle(circle_surface, (100, 100, 100, 255), (3, 3), 3)
-                    self.screen.blit(circle_surface, 
-                                   (self.paddle_left.rect.right + 10 - 3, mouse_pos[1] - 3))
-                else:
-                    pygame.draw.circle(self.screen, (100, 100, 100), 
-                                     (self.paddle_left.rect.right + 10, mouse_pos[1]), 3)
-            
-            
-            for modifier in self.modifiers:
-                modifier.draw(self.screen, antialiasing_enabled)
-            if self.extra_ball:
-                self.extra_ball.draw(self.screen, antialiasing_enabled)
-                
+            frame_time = min(self.clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)
+            result = self.frame(pygame.event.get(), frame_time)
+            if result is not None:
+                return result
             
-            y_offset = 80
-            for modifier_type, data in self.active_modifiers.items():
-                if data["active"]:
-                    color = (255, 0, 0) if modifier_type in ["paddle_size", "ball_speed"] else (255, 255, 0)
-                    text = self.instruction_font.render(
-                        f"{modifier_type.replace('_', ' ').title()}: {data['timer']:.1f}s", 
-                        True, color)
-                    text_rect = text.get_rect(centerx=self.width//2, top=y_offset)
-                    self.screen.blit(text, text_rect)
-                    y_offset += 30
-            
-            pygame.display.flip() 
\ No newline at end of file
+            start = profiler.begin()
+            pygame.display.update(self.dirty_rects)
+            profiler.end("present", start)
+            profiler.frame_done()
+
+    def frame(self, events, frame_time):
+        """Handles events, advances the simulation by frame_time and draws.
+        Returns "quit", "menu" or "scores:<score>" to leave the game, or
+        None to keep going; the changed screen rects are in dirty_rects."""
+        self.resize(*self.screen.get_size())
+        
+        start = profiler.begin()
+        result = self.handle_events(events)
+        profiler.end("input", start)
+        if result is not None:
+            return result
+        
+        if not self.game_over:
+            
+            mouse_y = pygame.mouse.get_pos()[1]
+            keys = pygame.key.get_pressed()
+            
+            
+            self.accumulator += frame_time
+            while self.accumulator >= self.tick:
+                self.step(mouse_y, keys[pygame.K_w], keys[pygame.K_s])
+                self.accumulator -= self.tick
+                if self.game_over:
+                    self.accumulator = 0.0
+                    self.save_replay()
+                    break
+        
+        start = profiler.begin()
+        self.dirty_rects = self.draw(self.accumulator / self.tick)
+        profiler.end("draw", start)
+        return None
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.QUIT:
+                return "quit"
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                if event.key == pygame.K_ESCAPE:
+                    pygame.mouse.set_visible(False)  
+                    return "menu"
+                if event.key == pygame.K_SPACE and self.game_over:
+                    self.reset_game()
+                if event.key == pygame.K_m and self.game_over:
+                    pygame.mouse.set_visible(False)  
+                    return "menu"
+                if event.key == pygame.K_t and self.game_over and self.winner == "Player":
+                    pygame.mouse.set_visible(False)  
+                    return f"scores:{self.total_score}"  
+        return None
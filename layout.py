@@ -0,0 +1,153 @@
+import pygame
+from physics import SpatialHash
+
+
+KEY_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT)
+
+
+def coalesce_motion(events):
+    """Keeps only the last of each run of MOUSEMOTION events, so a burst
+    from a high-rate mouse is handled once per frame. Motion is never
+    moved past a click or key press, so those still see the right hover."""
+    kept = []
+    for event in events:
+        if event.type == pygame.MOUSEMOTION and kept and kept[-1].type == pygame.MOUSEMOTION:
+            kept[-1] = event
+        else:
+            kept.append(event)
+    return kept
+
+
+class Stack:
+    """Widgets in a row or column, placed as one box against the screen.
+
+    anchor names a pygame.Rect point ("center", "bottomleft", ...); the
+    stack's box is put with that point on the same point of the screen,
+    moved by offset. Widgets are Buttons, or anything else with an
+    original_rect, place(x, y) and bounds().
+    """
+
+    def __init__(self, anchor="center", offset=(0, 0), spacing=0, vertical=True, layout=None):
+        self.layout = layout
+        self.anchor = anchor
+        self.offset = offset
+        self.spacing = spacing
+        self.vertical = vertical
+        self.items = []
+
+    def add(self, widget):
+        self.items.append(widget)
+        if self.layout is not None:
+            self.layout.add(widget)
+        return widget
+
+    def add_space(self, length):
+        """Leaves an empty slot of length pixels, plus the spacing."""
+        self.items.append(length)
+
+    def item_size(self, item):
+        if isinstance(item, int):
+            return (0, item) if self.vertical else (item, 0)
+        return item.original_rect.size
+
+    def size(self):
+        sizes = [self.item_size(item) for item in self.items]
+        gaps = self.spacing * max(0, len(sizes) - 1)
+        if self.vertical:
+            return max((w for w, h in sizes), default=0), sum(h for w, h in sizes) + gaps
+        return sum(w for w, h in sizes) + gaps, max((h for w, h in sizes), default=0)
+
+    def place(self, screen_rect):
+        box = pygame.Rect((0, 0), self.size())
+        x, y = getattr(screen_rect, self.anchor)
+        setattr(box, self.anchor, (x + self.offset[0], y + self.offset[1]))
+
+        position = box.top if self.vertical else box.left
+        for item in self.items:
+            width, height = self.item_size(item)
+            if not isinstance(item, int):
+                if self.vertical:
+                    item.place(box.centerx - width // 2, position)
+                else:
+                    item.place(position, box.centery - height // 2)
+            position += (height if self.vertical else width) + self.spacing
+
+
+class Layout:
+    """The widgets of one screen, laid out once per screen size.
+
+    resize() does the positioning and is a no-op while the size stays
+    the same, so it is cheap to call every frame. It also indexes the
+    widgets in a SpatialHash, so handle_event() hit-tests mouse events
+    against the few widgets near the pointer instead of all of them.
+    """
+
+    def __init__(self):
+        self.stacks = []
+        self.widgets = []
+        self.size = None
+        self.index = SpatialHash()
+        self.hovered = None
+        self.focused = None
+
+    def stack(self, anchor="center", offset=(0, 0), spacing=0, vertical=True):
+        stack = Stack(anchor, offset, spacing, vertical, layout=self)
+        self.stacks.append(stack)
+        return stack
+
+    def anchor(self, widget, anchor, offset=(0, 0)):
+        """Pins a single widget to a point of the screen."""
+        return self.stack(anchor, offset).add(widget)
+
+    def add(self, widget):
+        if widget not in self.widgets:
+            self.widgets.append(widget)
+        return widget
+
+    def resize(self, width, height):
+        if (width, height) == self.size:
+            return
+        self.size = (width, height)
+        screen_rect = pygame.Rect(0, 0, width, height)
+        for stack in self.stacks:
+            stack.place(screen_rect)
+        self.index.clear()
+        for widget in self.widgets:
+            self.index.insert(widget, widget.bounds())
+
+    def draw(self, screen):
+        for widget in self.widgets:
+            widget.draw(screen)
+
+    def targets(self, event):
+        if event.type in KEY_EVENTS:
+            return [self.focused] if self.focused is not None else []
+        pos = getattr(event, "pos", None)
+        if pos is None:
+            return [self.hovered] if self.hovered is not None else []
+        
+        under = self.index.query_point(pos)
+        targets = list(under)
+        # The widget the pointer just left, or that had focus before a
+        # click elsewhere, still hears about it so it can update itself.
+        if self.hovered is not None and self.hovered not in targets:
+            targets.append(self.hovered)
+        if event.type == pygame.MOUSEBUTTONDOWN and self.focused is not None and self.focused not in targets:
+            targets.append(self.focused)
+        
+        if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN):
+            hit = next((widget for widget in under if widget.rect.collidepoint(pos)), None)
+            if event.type == pygame.MOUSEMOTION:
+                self.hovered = hit
+            else:
+                self.focused = hit
+        return targets
+
+    def handle_event(self, event):
+        """Sends event to the widget under the pointer, or to the focused
+        one for key events. Returns the widget that was clicked, or None."""
+        clicked = None
+        for widget in self.targets(event):
+            if widget.handle_event(event) and clicked is None:
+                clicked = widget
+        return clicked
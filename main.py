@@ -3,17 +3,23 @@ import sys
 import os
 import time
 from pygame import gfxdraw
-from menu import Menu
-from game import Game
+from menu import Menu, SettingsMenu, BugReportMenu, InfoMenu, GlobalScoresMenu, bug_reporter, get_settings
+from game import Game, MAX_FRAME_TIME
+from audio import sound_bank
+from profiler import profiler
+from transitions import Transitions, Fade, Hold, Crossfade, AudioDuck
+from scenes import SceneManager
+from display import Display, DISPLAY_SETTINGS
+from cache import gradient_cache
+from layout import coalesce_motion
 
 
 pygame.init()
 pygame.mixer.init()
 
 
-WINDOW_WIDTH = 960
-WINDOW_HEIGHT = 540
 FPS = 60
+CROSSFADE_TIME = 0.35
 
 
 WHITE = (255, 255, 255)
@@ -23,8 +29,9 @@ ACCENT = (0, 255, 200)
 
 class PingPong:
     def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("mit's ping bang")
+        self.display = Display(get_settings(), "mit's ping bang")
+        self.display.apply()
+        self.screen = self.display.screen
         self.clock = pygame.time.Clock()
         
         
@@ -35,9 +42,24 @@ class PingPong:
             os.makedirs('assets')
             
         
+        sound_bank.preload()
+        bug_reporter.start()
+        
+        
         self.menu = Menu(self.screen)
         self.game = Game(self.screen, ai_difficulty="easy")
-        self.current_state = "menu"
+        
+        
+        # Every screen is built once and kept, so opening one again only
+        # runs its enter() hook.
+        self.scenes = SceneManager()
+        self.scenes.add("menu", self.menu)
+        self.scenes.add("game", self.game)
+        self.scenes.register("settings", lambda: SettingsMenu(self.screen, self.menu.settings))
+        self.scenes.register("bug_report", lambda: BugReportMenu(self.screen))
+        self.scenes.register("info", lambda: InfoMenu(self.screen))
+        self.scenes.register("scores", lambda: GlobalScoresMenu(self.screen))
+        self.scenes.push("menu")
         
         
         try:
@@ -52,110 +74,149 @@ class PingPong:
             print("Background music file not found")
             
         
-        try:
-            self.lose_sound = pygame.mixer.Sound('assets/lose.wav')
-            self.lose_sound.set_volume(1.0)
-        except:
-            print("Lose sound file not found")
-            self.lose_sound = None
-            
-    def fade_out(self, duration=1.0):
-        """Fade out the screen to black and fade out the music"""
-        
-        fade_surface = pygame.Surface((self.screen.get_width(), self.screen.get_height()))
-        fade_surface.fill(BLACK)
-        
-        
-        initial_volume = pygame.mixer.music.get_volume()
+        self.lose_sound = sound_bank.get('assets/lose.wav')
         
         
-        steps = int(duration * FPS)
-        alpha_step = 255 / steps
-        volume_step = initial_volume / steps
+        self.menu.settings.subscribe(self.on_setting_changed)
         
         
-        current_screen = pygame.Surface((self.screen.get_width(), self.screen.get_height()))
-        current_screen.blit(self.screen, (0, 0))
-        
-        
-        for i in range(steps + 1):
-            
-            alpha = min(255, int(alpha_step * i))
-            volume = max(0, initial_volume - (volume_step * i))
-            
-            
-            pygame.mixer.music.set_volume(volume)
-            
+        self.transitions = Transitions()
+        self.running = True
+        self.quitting = False
             
-            self.screen.blit(current_screen, (0, 0))
+    def on_setting_changed(self, key, value):
+        if key == 'music_enabled':
+            pygame.mixer.music.set_volume(self.music_volume())
+        elif key in DISPLAY_SETTINGS:
+            self.apply_display()
             
+    def apply_display(self):
+        """Switches to the display mode in the settings. The menus and the
+        match in progress are kept; they are only laid out again when the
+        logical screen size changes."""
+        resized = self.display.apply()
+        self.screen = self.display.screen
+        # A crossfade still holds a picture of the old mode.
+        self.transitions.cancel(Crossfade)
+        self.game.full_redraw = True
+        if resized:
+            # Fonts and sprites are sized in logical pixels and stay valid;
+            # only the gradients are baked per screen size.
+            gradient_cache.clear()
+            self.scenes.resize(*self.screen.get_size())
             
-            fade_surface.set_alpha(alpha)
-            
-            
-            self.screen.blit(fade_surface, (0, 0))
-            
-            
-            pygame.display.flip()
+    def music_volume(self):
+        return 1.0 if self.menu.settings.current_settings['music_enabled'] else 0.0
             
-            
-            self.clock.tick(FPS)
-            
-        
+    def fade_out(self, duration=1.0):
+        """Fade out the screen to black and fade out the music, then play
+        the lose sound. Runs frame by frame inside run()."""
+        if self.quitting:
+            return
+        self.quitting = True
+        self.transitions.clear()
+        self.transitions.start(Fade(self.screen.copy(), duration, BLACK, on_done=self.play_quit_sound))
+        self.transitions.start(AudioDuck(0.0, duration))
+
+    def play_quit_sound(self):
+        length = 0.0
         if self.lose_sound:
             self.lose_sound.play()
+            length = self.lose_sound.get_length()
+        self.transitions.start(Hold(length, BLACK, on_done=self.stop))
+
+    def skip_fade_out(self):
+        if self.lose_sound:
+            self.lose_sound.stop()
+        self.transitions.clear()
+        self.stop()
+
+    def stop(self):
+        pygame.mixer.music.stop()
+        self.running = False
+
+    def crossfade(self):
+        self.transitions.cancel(Crossfade)
+        self.transitions.start(Crossfade(self.screen.copy(), CROSSFADE_TIME))
+
+    def duck_music(self, level, hold, fade=0.2):
+        """Lowers the music to level for hold seconds, then brings it back."""
+        volume = self.music_volume()
+        self.transitions.cancel(AudioDuck)
+        
+        def restore():
+            self.transitions.start(AudioDuck(volume, fade * 2))
             
-            pygame.time.wait(int(self.lose_sound.get_length() * 1000))
+        def held():
+            self.transitions.start(AudioDuck(volume * level, hold, on_done=restore))
             
-        
-        pygame.mixer.music.stop()
+        self.transitions.start(AudioDuck(volume * level, fade, on_done=held))
 
-    def run(self):
-        while True:
-            if self.current_state == "menu":
-                result = self.menu.run()
-                if result == "quit":
-                    self.fade_out(2.0)  # 2 second fadeout
-                    break
-                elif result.startswith("game:"):
-                    self.current_state = "game"
-                    self.game = Game(self.screen, ai_difficulty=result.split(":")[1])
-                elif result == "scores":
-                    self.current_state = "scores"
-            elif self.current_state == "game":
-                result = self.game.run()
-                if result == "quit":
-                    self.fade_out(2.0)  # 2 second fadeout
-                    break
-                elif result == "menu":
-                    self.current_state = "menu"
-                elif result.startswith("scores:"):
-                    score = int(result.split(":")[1])
-                    self.current_state = "scores"
-                    result = self.menu.run_global_scores_menu(score)
-                    if result == "quit":
-                        self.fade_out(2.0)  # 2 second fadeout
-                        break
-                    elif result == "back":
-                        self.current_state = "menu"
-            elif self.current_state == "scores":
-                result = self.menu.run_global_scores_menu()
-                if result == "quit":
-                    self.fade_out(2.0)  # 2 second fadeout
-                    break
-                elif result == "back":
-                    self.current_state = "menu"
-            elif self.current_state == "fullscreen_toggle":
-                pygame.display.toggle_fullscreen()
-                self.screen = pygame.display.get_surface()
-                self.menu = Menu(self.screen)
-                if hasattr(self, 'game'):
-                    difficulty = self.game.paddle_right.ai_difficulty
-                    self.game = Game(self.screen, ai_difficulty=difficulty)
+    def update_scene(self, events, frame_time):
+        in_game = self.scenes.current is self.game
+        was_over = self.game.game_over
+        result = self.scenes.frame(events, frame_time)
+        if in_game and self.game.game_over and not was_over and self.lose_sound:
+            self.duck_music(0.3, self.lose_sound.get_length())
+            
+        if result is None:
+            return
+        if result == "quit":
+            self.fade_out(2.0)  # 2 second fadeout
+        elif result.startswith("game:"):
+            self.scenes.push("game", ai_difficulty=result.split(":")[1])
+            self.crossfade()
+        elif result.startswith("scores:"):
+            score = int(result.split(":")[1])
+            self.scenes.replace("scores", color_scheme=self.menu.target_color_scheme,
+                                score_to_submit=score, difficulty=self.game.ai_difficulty)
+        elif result == "scores":
+            self.scenes.push("scores", color_scheme=self.menu.target_color_scheme,
+                             difficulty=self.menu.difficulty.lower())
+        elif result in ("settings", "bug_report", "info"):
+            self.scenes.push(result, color_scheme=self.menu.target_color_scheme)
+        elif result in ("back", "menu"):
+            self.scenes.pop()
+            if in_game:
+                self.crossfade()
 
+    def present(self):
+        start = profiler.begin()
+        if self.scenes.current is self.game and not self.transitions.covers_screen():
+            if self.display.scaled:
+                # Under SCALED SDL uploads and stretches the whole screen
+                # whatever rects are passed, so only the drawing is saved.
+                pygame.display.flip()
+            else:
+                pygame.display.update(self.game.dirty_rects)
+        else:
             pygame.display.flip()
-            self.clock.tick(FPS)
+            # The game only repaints what it drew last frame, so anything
+            # drawn over it means a full repaint next time.
+            self.game.full_redraw = True
+        profiler.end("present", start)
+        profiler.frame_done()
+
+    def run(self):
+        while self.running:
+            frame_time = min(self.clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)
+            events = coalesce_motion(pygame.event.get())
+            
+            if self.quitting:
+                # Closing the window again, a key or a click skips the fade.
+                for event in events:
+                    if event.type in (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                        self.skip_fade_out()
+                        break
+            else:
+                self.update_scene(events, frame_time)
+                
+            self.transitions.update(frame_time)
+            if not self.running:
+                break
+            self.transitions.draw(self.screen)
+            self.present()
 
 if __name__ == "__main__":
     game = PingPong()
-    game.run() 
\ No newline at end of file
+    game.run()
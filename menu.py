@@ -2,10 +2,19 @@ import pygame
 import sys
 import json
 import os
-import platform
-import requests
+import atexit
+import stat
+import tempfile
+import threading
 from pygame import gfxdraw
 import datetime
+from cache import text_cache, gradient_cache, get_font
+from audio import sound_bank
+from scores import get_score_store
+from profiler import profiler
+from scenes import Scene
+from layout import Layout, coalesce_motion
+from reporter import BugReporter, QUEUED, SENDING, RETRYING, SENT, SAVED
 
 
 COLOR_SCHEMES = {
@@ -34,11 +43,13 @@ COLOR_SCHEMES = {
 
 DISCORD_WEBHOOK_URL = "nuh uh"
 
+bug_reporter = BugReporter(DISCORD_WEBHOOK_URL)
+
 class TextBox:
     def __init__(self, x, y, width, height, font_size=24, color_scheme=None, max_chars=200):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = ""
-        self.font = pygame.font.Font(None, font_size)
+        self.font = get_font(font_size)
         self.active = False
         self.color_scheme = color_scheme or COLOR_SCHEMES["EASY"]
         self.cursor_visible = True
@@ -57,6 +68,16 @@ class TextBox:
         self.last_time = pygame.time.get_ticks()
         self.max_chars = max_chars
         
+    @property
+    def original_rect(self):
+        return self.rect
+
+    def place(self, x, y):
+        self.rect.topleft = (x, y)
+
+    def bounds(self):
+        return self.rect
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.rect.collidepoint(event.pos):
@@ -94,21 +115,20 @@ class TextBox:
         
         for word in words:
             test_line = ' '.join(current_line + [word])
-            text_surface = self.font.render(test_line, True, self.text_color)
             
-            if text_surface.get_width() <= max_width:
+            if self.font.size(test_line)[0] <= max_width:
                 current_line.append(word)
             else:
                 if current_line:
                     self.wrapped_lines.append(' '.join(current_line))
                 
-                if self.font.render(word, True, self.text_color).get_width() > max_width:
+                if self.font.size(word)[0] > max_width:
                     
                     chars = list(word)
                     current_chars = []
                     for char in chars:
                         test_chars = ''.join(current_chars + [char])
-                        if self.font.render(test_chars, True, self.text_color).get_width() <= max_width:
+                        if self.font.size(test_chars)[0] <= max_width:
                             current_chars.append(char)
                         else:
                             if current_chars:
@@ -156,9 +176,9 @@ class TextBox:
         for i, line in enumerate(self.wrapped_lines[start_line:end_line]):
             if not self.text and i == 0:
                 
-                text = self.font.render(line, True, self.placeholder_color)
+                text = text_cache.render(self.font, line, True, self.placeholder_color)
             else:
-                text = self.font.render(line, True, self.text_color)
+                text = text_cache.render(self.font, line, True, self.text_color)
                 
             screen.blit(text, (self.rect.x + self.padding, 
                               self.rect.y + self.padding + i * self.line_height))
@@ -177,8 +197,7 @@ class TextBox:
                 
                 if self.text:
                     cursor_text = self.text[:len(self.text)]
-                    cursor_surface = self.font.render(cursor_text, True, self.text_color)
-                    cursor_x = self.rect.x + self.padding + cursor_surface.get_width()
+                    cursor_x = self.rect.x + self.padding + self.font.size(cursor_text)[0]
                 else:
                     cursor_x = self.rect.x + self.padding
                     
@@ -188,9 +207,9 @@ class TextBox:
                                 (cursor_x, cursor_y + self.font.get_height()))
         
         
-        char_count_font = pygame.font.Font(None, 20)
+        char_count_font = get_font(20)
         char_count_text = f"{len(self.text)}/{self.max_chars}"
-        char_count_surface = char_count_font.render(char_count_text, True, (100, 100, 100))
+        char_count_surface = text_cache.render(char_count_font, char_count_text, True, (100, 100, 100))
         char_count_rect = char_count_surface.get_rect(right=self.rect.right - 10, bottom=self.rect.bottom - 5)
         screen.blit(char_count_surface, char_count_rect)
                 
@@ -199,11 +218,15 @@ class TextBox:
     def get_text(self):
         return self.text
 
+    def set_color_scheme(self, color_scheme):
+        self.color_scheme = color_scheme
+        self.border_color = color_scheme["button_border"]
+
 class Button:
     def __init__(self, x, y, width, height, text, font_size=32, sound_file=None, color_scheme=None, icon=None):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
-        self.font = pygame.font.Font(None, font_size)
+        self.font = get_font(font_size)
         self.color = (40, 40, 40)
         self.hover_color = (60, 60, 60)
         self.text_color = (0, 0, 0)
@@ -223,24 +246,35 @@ class Button:
         
     def load_sounds(self):
         
-        try:
-            self.hover_sound = pygame.mixer.Sound('assets/hover.wav')
-            self.hover_sound.set_volume(1.0)
-        except:
-            print(f"Hover sound file not found")
-            
+        self.hover_sound = sound_bank.get('assets/hover.wav')
         if self.sound_file:
-            try:
-                self.click_sound = pygame.mixer.Sound(self.sound_file)
-                self.click_sound.set_volume(1.0) 
-            except:
-                print(f"Click sound file {self.sound_file} not found")
+            self.click_sound = sound_bank.get(self.sound_file)
     
     def set_color_scheme(self, new_scheme):
 
         self.target_color_scheme = new_scheme
         self.transition_progress = 0
-    
+
+    def place(self, x, y):
+        self.original_rect.topleft = (x, y)
+        self.rect.topleft = (x, y)
+
+    def bounds(self):
+        """The most room the button can take up, with the grow and lift
+        of the hover animation."""
+        return self.original_rect.inflate(int(self.original_rect.width * 0.08) + 2,
+                                          int(self.original_rect.height * 0.08) + 14)
+
+    def reset(self, color_scheme=None):
+        """Clears the hover state, and switches straight to color_scheme,
+        for a screen that is shown again rather than rebuilt."""
+        if color_scheme is not None:
+            self.color_scheme = color_scheme
+            self.target_color_scheme = color_scheme
+            self.transition_progress = 1.0
+        self.is_hovered = False
+        self.animation_progress = 0
+
     def update_transition(self, speed=0.01):
 
         if self.transition_progress < 1.0:
@@ -317,31 +351,31 @@ class Button:
             if self.icon == "i":
                 
                 pygame.draw.circle(screen, text_color, icon_rect.center, icon_size/2, 2)
-                info_text = self.font.render("i", True, text_color)
+                info_text = text_cache.render(self.font, "i", True, text_color)
                 info_rect = info_text.get_rect(center=icon_rect.center)
                 screen.blit(info_text, info_rect)
             elif self.icon == "?":
                 
                 pygame.draw.circle(screen, text_color, icon_rect.center, icon_size/2, 2)
-                question_mark = self.font.render("?", True, text_color)
+                question_mark = text_cache.render(self.font, "?", True, text_color)
                 question_rect = question_mark.get_rect(center=icon_rect.center)
                 screen.blit(question_mark, question_rect)
             elif self.icon == "L":
-                leaderboard_text = self.font.render("L", True, text_color)
+                leaderboard_text = text_cache.render(self.font, "L", True, text_color)
                 leaderboard_rect = leaderboard_text.get_rect(center=icon_rect.center)
                 screen.blit(leaderboard_text, leaderboard_rect)
             elif self.icon == "📊":
-                chart_text = self.font.render("📊", True, text_color)
+                chart_text = text_cache.render(self.font, "📊", True, text_color)
                 chart_rect = chart_text.get_rect(center=icon_rect.center)
                 screen.blit(chart_text, chart_rect)
             elif self.icon == "🏆":
                 
-                trophy_text = self.font.render("🏆", True, text_color)
+                trophy_text = text_cache.render(self.font, "🏆", True, text_color)
                 trophy_rect = trophy_text.get_rect(center=icon_rect.center)
                 screen.blit(trophy_text, trophy_rect)
         else:
-            text_shadow = self.font.render(self.text, True, (150, 150, 150))
-            text_surface = self.font.render(self.text, True, text_color)
+            text_shadow = text_cache.render(self.font, self.text, True, (150, 150, 150))
+            text_surface = text_cache.render(self.font, self.text, True, text_color)
             text_rect = text_surface.get_rect(center=self.rect.center)
             shadow_text_rect = text_rect.copy()
             shadow_text_rect.x += 2
@@ -398,14 +432,31 @@ class CustomCursor:
         screen.blit(self.cursor_surface, (pos[0] - self.cursor_size//2, pos[1] - self.cursor_size//2))
 
 class Settings:
-    def __init__(self):
-        self.settings_file = "settings.json"
+    """In-memory settings store shared through get_settings().
+
+    update_setting() notifies subscribers immediately and schedules a
+    debounced save; saves write a temp file and rename it over
+    settings.json so a crash never leaves a half-written file.
+    """
+
+    def __init__(self, settings_file="settings.json", save_delay=0.5):
+        self.settings_file = settings_file
+        self.save_delay = save_delay
         self.default_settings = {
             "fullscreen": False,
+            "resolution": "960x540",
+            "render_resolution": "960x540",
             "music_enabled": True,
             "antialiasing_enabled": True
         }
         self.current_settings = self.load_settings()
+        self.listeners = []
+        self.lock = threading.Lock()
+        # Held for a whole save, so the timer thread and flush() at exit
+        # never write the file at the same time.
+        self.write_lock = threading.Lock()
+        self.save_timer = None
+        self.dirty = False
         
     def load_settings(self):
         if os.path.exists(self.settings_file):
@@ -422,17 +473,93 @@ class Settings:
         return self.default_settings.copy()
         
     def save_settings(self):
-        with open(self.settings_file, 'w') as f:
-            json.dump(self.current_settings, f)
+        with self.write_lock:
+            with self.lock:
+                self.dirty = False
+                data = dict(self.current_settings)
+            temp_file = None
+            try:
+                fd, temp_file = tempfile.mkstemp(suffix=".tmp", prefix="settings-",
+                                                 dir=os.path.dirname(os.path.abspath(self.settings_file)))
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f)
+                # mkstemp makes the file private to the user; give it the
+                # mode settings.json has, or would get, instead.
+                os.chmod(temp_file, self.file_mode())
+                os.replace(temp_file, self.settings_file)
+            except OSError as e:
+                print(f"Error saving settings: {e}")
+                with self.lock:
+                    self.dirty = True
+                if temp_file is not None and os.path.exists(temp_file):
+                    try:
+                        os.remove(temp_file)
+                    except OSError:
+                        pass
+            
+    def file_mode(self):
+        try:
+            return stat.S_IMODE(os.stat(self.settings_file).st_mode)
+        except OSError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+            
+    def schedule_save(self):
+        with self.lock:
+            self.dirty = True
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+            self.save_timer = threading.Timer(self.save_delay, self.save_settings)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+            
+    def flush(self):
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+            dirty = self.dirty
+        if dirty:
+            self.save_settings()
+            
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+        
+    def unsubscribe(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+            
+    def update_settings(self, changes):
+        with self.lock:
+            changed = {key: value for key, value in changes.items()
+                       if self.current_settings.get(key) != value}
+            if not changed:
+                return
+            self.current_settings.update(changed)
+        for key, value in changed.items():
+            for callback in list(self.listeners):
+                callback(key, value)
+        self.schedule_save()
             
     def update_setting(self, key, value):
-        self.current_settings[key] = value
-        self.save_settings()
+        self.update_settings({key: value})
+
+
+shared_settings = None
+
 
-class BugReportMenu:
+def get_settings():
+    global shared_settings
+    if shared_settings is None:
+        shared_settings = Settings()
+        atexit.register(shared_settings.flush)
+    return shared_settings
+
+class BugReportMenu(Scene):
     def __init__(self, screen, color_scheme=None):
         self.screen = screen
-        self.settings = Settings()
+        self.settings = get_settings()
         self.width = screen.get_width()
         self.height = screen.get_height()
         self.cursor = CustomCursor()
@@ -441,44 +568,23 @@ class BugReportMenu:
         self.color_scheme = color_scheme or COLOR_SCHEMES["EASY"]
         
         
-        form_width = 600
-        form_height = 500
-        form_x = (self.width - form_width) // 2
-        form_y = (self.height - form_height) // 2
-        
-        self.form_rect = pygame.Rect(form_x, form_y, form_width, form_height)
-        
+        # The form is 600x500 around the middle of the screen: the text box
+        # near its top and the two buttons along its bottom edge.
+        self.layout = Layout()
+        self.text_box = self.layout.anchor(
+            TextBox(0, 0, 560, 200, font_size=24, color_scheme=self.color_scheme, max_chars=200),
+            "center", (0, -30))
         
-        text_box_width = form_width - 40
-        text_box_height = 200
-        text_box_x = form_x + 20
-        text_box_y = form_y + 120
+        buttons = self.layout.stack("center", (0, 205), spacing=120, vertical=False)
+        self.submit_button = buttons.add(Button(0, 0, 200, 50, "SUBMIT", 32,
+                                                sound_file='assets/settings_menu_click.wav',
+                                                color_scheme=self.color_scheme))
+        self.back_button = buttons.add(Button(0, 0, 200, 50, "BACK", 32,
+                                              sound_file='assets/settings_menu_click.wav',
+                                              color_scheme=self.color_scheme))
+        self.layout.resize(self.width, self.height)
         
-        self.text_box = TextBox(text_box_x, text_box_y, text_box_width, text_box_height, 
-                               font_size=24, color_scheme=self.color_scheme, max_chars=200)
-        
-        
-        button_width = 200
-        button_height = 50
-        button_spacing = 40
-        
-        self.submit_button = Button(
-            form_x + button_spacing,
-            form_y + form_height - button_height - 20,
-            button_width, button_height, "SUBMIT", 32,
-            sound_file='assets/settings_menu_click.wav',
-            color_scheme=self.color_scheme
-        )
-        
-        self.back_button = Button(
-            form_x + form_width - button_width - button_spacing,
-            form_y + form_height - button_height - 20,
-            button_width, button_height, "BACK", 32,
-            sound_file='assets/settings_menu_click.wav',
-            color_scheme=self.color_scheme
-        )
-        
-        self.title_font = pygame.font.Font(None, 64)
+        self.title_font = get_font(64)
         
         
         self.system_info = self.get_system_info()
@@ -487,6 +593,7 @@ class BugReportMenu:
         self.show_success = False
         self.success_timer = 0
         self.success_duration = 3000  
+        self.report_id = None
         
         
         self.fade_alpha = 0
@@ -498,6 +605,8 @@ class BugReportMenu:
         
     def get_system_info(self):
 
+        import platform
+        
         info = {
             "OS": platform.system() + " " + platform.release(),
             "Python": platform.python_version(),
@@ -507,12 +616,7 @@ class BugReportMenu:
         }
         
         
-        try:
-            with open("settings.json", 'r') as f:
-                settings = json.load(f)
-                info["Game Settings"] = settings
-        except:
-            info["Game Settings"] = "Could not load settings"
+        info["Game Settings"] = dict(self.settings.current_settings)
             
         return info
         
@@ -520,7 +624,7 @@ class BugReportMenu:
 
         if DISCORD_WEBHOOK_URL == "YOUR_DISCORD_WEBHOOK_URL_HERE":
             print("Discord webhook URL not configured")
-            return False
+            return None
             
         
         system_info_text = ""
@@ -568,213 +672,192 @@ class BugReportMenu:
             ]
         }
         
-        try:
-            response = requests.post(DISCORD_WEBHOOK_URL, json=message)
-            return response.status_code == 204
-        except Exception as e:
-            print(f"Error sending to Discord: {e}")
+        bug_reporter.start()
+        return bug_reporter.submit(message)
+        
+    def report_in_progress(self):
+        if not self.report_id:
             return False
-            
-    def run(self):
+        state, detail = bug_reporter.status(self.report_id)
+        return state in (QUEUED, SENDING, RETRYING)
+        
+    def report_status_text(self, state, detail):
+        if state == QUEUED:
+            return "Bug report queued...", (100, 100, 100)
+        elif state == SENDING:
+            return f"Sending bug report ({detail})...", (100, 100, 100)
+        elif state == RETRYING:
+            return f"Could not reach the server: {detail}", (200, 120, 0)
+        elif state == SENT:
+            return "Bug report sent successfully!", (0, 200, 0)
+        elif state == SAVED:
+            return "Bug report saved, it will be sent next time the game starts.", (200, 120, 0)
+        return f"Bug report could not be sent ({detail}), it was kept in the outbox.", (200, 0, 0)
+            
+    def enter(self, color_scheme=None):
+        if color_scheme is not None:
+            self.color_scheme = color_scheme
+            self.text_box.set_color_scheme(color_scheme)
+        self.submit_button.reset(self.color_scheme)
+        self.back_button.reset(self.color_scheme)
+        
+        # The menu is kept between visits, so the details are read again.
+        self.system_info = self.get_system_info()
+        if not self.report_in_progress():
+            self.report_id = None
+            self.show_success = False
+        
         self.fade_in = True
         self.fade_out = False
         self.fade_alpha = 0
         
-        while True:
-            self.width = self.screen.get_width()
-            self.height = self.screen.get_height()
-            
-            
-            if self.fade_in:
-                self.fade_alpha = min(255, self.fade_alpha + self.fade_speed)
-                if self.fade_alpha >= 255:
-                    self.fade_in = False
-            elif self.fade_out:
-                self.fade_alpha = max(0, self.fade_alpha - self.fade_speed)
-                if self.fade_alpha <= 0:
-                    return "back"
-            
-            
-            bg_start, bg_end = self.color_scheme["background"]
-            self.screen.fill(bg_start)
-            gradient_steps = 12
-            step_height = self.height / gradient_steps
-            
-            for i in range(gradient_steps):
-                r = int(bg_start[0] + (bg_end[0] - bg_start[0]) * (i / gradient_steps))
-                g = int(bg_start[1] + (bg_end[1] - bg_start[1]) * (i / gradient_steps))
-                b = int(bg_start[2] + (bg_end[2] - bg_start[2]) * (i / gradient_steps))
-                color = (r, g, b)
-                pygame.draw.rect(self.screen, color,
-                               (0, i * step_height, self.width, step_height + 1))
-            
-            
-            title = self.title_font.render("REPORT A BUG", True, self.color_scheme["text"])
-            title_rect = title.get_rect(centerx=self.width // 2, centery=self.height // 6)  
-            
-            
-            for offset in range(4, 0, -1):
-                shadow_rect = title_rect.copy()
-                shadow_rect.x += offset
-                shadow_rect.y += offset
-                shadow = self.title_font.render("REPORT A BUG", True, 
-                                              (220 - offset*10, 220 - offset*10, 220 - offset*10))
-                self.screen.blit(shadow, shadow_rect)
-            
-            self.screen.blit(title, title_rect)
-            
-            
-            desc_font = pygame.font.Font(None, 28)
-            desc_text = "Please describe the bug you encountered :3"
-            desc_surface = desc_font.render(desc_text, True, self.color_scheme["text"])
-            desc_rect = desc_surface.get_rect(centerx=self.width // 2, y=self.text_box.rect.y - 30)
-            self.screen.blit(desc_surface, desc_rect)
-            
-            
-            self.text_box.draw(self.screen)
-            
-            
-            self.submit_button.draw(self.screen)
-            self.back_button.draw(self.screen)
-            
-            
-            if self.show_success:
-                success_font = pygame.font.Font(None, 24)  
-                success_text = "Bug report sent successfully!"
-                success_surface = success_font.render(success_text, True, (0, 200, 0))
-                success_rect = success_surface.get_rect(centerx=self.width // 2, 
-                                                      bottom=self.height - 40)  
-                self.screen.blit(success_surface, success_rect)
-            
-            
-            privacy_font = pygame.font.Font(None, 20)
-            privacy_text = "Note: Only system information such as OS, Game settings, Python, Pygame version and game logs are shared."
-            privacy_surface = privacy_font.render(privacy_text, True, (100, 100, 100))
-            privacy_rect = privacy_surface.get_rect(centerx=self.width // 2, 
-                                                  bottom=self.height - 20)
-            self.screen.blit(privacy_surface, privacy_rect)
-            
-            
-            mouse_pos = pygame.mouse.get_pos()
-            self.cursor.draw(self.screen, mouse_pos)
-            
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "quit"
-                    
-                if self.text_box.handle_event(event):
-                    pass
-                    
-                if self.submit_button.handle_event(event):
-                    bug_description = self.text_box.get_text()
-                    if bug_description:
-                        if self.send_to_discord(bug_description):
-                            
-                            self.show_success = True
-                            self.success_timer = pygame.time.get_ticks()
-                            
-                            
-                            self.fade_start_time = pygame.time.get_ticks()
-                            self.fade_out = True
-                            
-                        return "back"
-                        
-                if self.back_button.handle_event(event):
-                    
-                    self.fade_out = True
-            
-            
-            if self.show_success:
-                if pygame.time.get_ticks() - self.success_timer > self.success_duration:
-                    self.show_success = False
+    def frame(self, events, frame_time=None):
+        self.width = self.screen.get_width()
+        self.height = self.screen.get_height()
+        
+        
+        if self.fade_in:
+            self.fade_alpha = min(255, self.fade_alpha + self.fade_speed)
+            if self.fade_alpha >= 255:
+                self.fade_in = False
+        elif self.fade_out:
+            self.fade_alpha = max(0, self.fade_alpha - self.fade_speed)
+            if self.fade_alpha <= 0:
+                return "back"
+        
+        
+        gradient_cache.draw(self.screen, self.color_scheme["background"])
+        self.layout.resize(self.width, self.height)
+        
+        
+        title = text_cache.render(self.title_font, "REPORT A BUG", True, self.color_scheme["text"])
+        title_rect = title.get_rect(centerx=self.width // 2, centery=self.height // 6)  
+        
+        
+        for offset in range(4, 0, -1):
+            shadow_rect = title_rect.copy()
+            shadow_rect.x += offset
+            shadow_rect.y += offset
+            shadow = text_cache.render(self.title_font, "REPORT A BUG", True, 
+                                          (220 - offset*10, 220 - offset*10, 220 - offset*10))
+            self.screen.blit(shadow, shadow_rect)
+        
+        self.screen.blit(title, title_rect)
+        
+        
+        desc_font = get_font(28)
+        desc_text = "Please describe the bug you encountered :3"
+        desc_surface = text_cache.render(desc_font, desc_text, True, self.color_scheme["text"])
+        desc_rect = desc_surface.get_rect(centerx=self.width // 2, y=self.text_box.rect.y - 30)
+        self.screen.blit(desc_surface, desc_rect)
+        
+        
+        self.layout.draw(self.screen)
+        
+        
+        if self.report_id:
+            state, detail = bug_reporter.status(self.report_id)
+            if state == SENT and not self.show_success:
+                self.show_success = True
+                self.success_timer = pygame.time.get_ticks()
+                
+                
+                self.fade_start_time = pygame.time.get_ticks()
+                self.fade_out = True
+                
+            status_font = get_font(24)
+            status_text, status_color = self.report_status_text(state, detail)
+            status_surface = text_cache.render(status_font, status_text, True, status_color)
+            status_rect = status_surface.get_rect(centerx=self.width // 2, 
+                                                bottom=self.height - 40)  
+            self.screen.blit(status_surface, status_rect)
+        
+        
+        privacy_font = get_font(20)
+        privacy_text = "Note: Only system information such as OS, Game settings, Python, Pygame version and game logs are shared."
+        privacy_surface = text_cache.render(privacy_font, privacy_text, True, (100, 100, 100))
+        privacy_rect = privacy_surface.get_rect(centerx=self.width // 2, 
+                                              bottom=self.height - 20)
+        self.screen.blit(privacy_surface, privacy_rect)
+        
+        
+        mouse_pos = pygame.mouse.get_pos()
+        self.cursor.draw(self.screen, mouse_pos)
+        
+        
+        for event in events:
+            if event.type == pygame.QUIT:
+                return "quit"
+                
+            clicked = self.layout.handle_event(event)
+            if clicked is self.submit_button:
+                bug_description = self.text_box.get_text()
+                if bug_description and not self.report_in_progress():
+                    report_id = self.send_to_discord(bug_description)
+                    if report_id:
+                        self.report_id = report_id
+                        self.show_success = False
+                        self.text_box.text = ""
+                        self.text_box.update_wrapped_lines()
                     
-            pygame.display.flip()
+            if clicked is self.back_button:
+                
+                self.fade_out = True
+        return None
 
-class Menu:
+class Menu(Scene):
     def __init__(self, screen):
         self.screen = screen
         self.width = screen.get_width()
         self.height = screen.get_height()
         
         
-        self.settings = Settings()
+        self.settings = get_settings()
         self.cursor = CustomCursor()
         
         
-        if self.settings.current_settings['fullscreen']:
-            pygame.display.toggle_fullscreen()
-            
-            self.width = screen.get_width()
-            self.height = screen.get_height()
-        
-        
         pygame.mouse.set_visible(False)
         
-        button_width = 240
-        button_height = 60
-        vertical_spacing = 80
-        
-        start_y = self.height // 2 + 40
-        
         self.difficulty = "EASY"
         
-        button_x = self.width // 2 - button_width // 2
-        
-        self.play_button = Button(button_x, start_y - vertical_spacing * 2,
-                                button_width, button_height, "PLAY", 42, 
-                                sound_file='assets/play_click.wav',
-                                color_scheme=COLOR_SCHEMES["EASY"])
-        self.difficulty_button = Button(button_x, start_y - vertical_spacing,
-                                      button_width, button_height, f"AI: {self.difficulty}", 42,
-                                      sound_file='assets/settings_menu_click.wav',
-                                      color_scheme=COLOR_SCHEMES["EASY"])
-        self.settings_button = Button(button_x, start_y,
-                                    button_width, button_height, "SETTINGS", 42,
-                                    sound_file='assets/settings_click.wav',
-                                    color_scheme=COLOR_SCHEMES["EASY"])
-        self.quit_button = Button(button_x, start_y + vertical_spacing,
-                                button_width, button_height, "QUIT", 42,
-                                sound_file='assets/settings_menu_click.wav',
-                                color_scheme=COLOR_SCHEMES["EASY"])
-        
-        
-        bug_button_size = 50
-        bug_button_x = self.width - bug_button_size - 20
-        bug_button_y = self.height - bug_button_size - 20
-        
-        self.bug_report_button = Button(bug_button_x, bug_button_y, 
-                                       bug_button_size, bug_button_size, "", 
-                                       font_size=36, 
-                                       sound_file='assets/settings_menu_click.wav',
-                                       color_scheme=COLOR_SCHEMES["EASY"],
-                                       icon="?")
-        
-        
-        info_button_size = 50
-        info_button_x = 20
-        info_button_y = self.height - info_button_size - 20
-        
-        self.info_button = Button(info_button_x, info_button_y, 
-                                 info_button_size, info_button_size, "", 
-                                 font_size=36, 
-                                 sound_file='assets/settings_menu_click.wav',
-                                 color_scheme=COLOR_SCHEMES["EASY"],
-                                 icon="i")
-        
-        
-        trophy_button_size = 50
-        trophy_button_x = info_button_x + trophy_button_size + 10
-        trophy_button_y = info_button_y
-        
-        self.trophy_button = Button(trophy_button_x, trophy_button_y, 
-                                   trophy_button_size, trophy_button_size, "", 
-                                   font_size=36, 
-                                   sound_file='assets/settings_menu_click.wav',
-                                   color_scheme=COLOR_SCHEMES["EASY"],
-                                   icon="L")
-        
-        self.title_font = pygame.font.Font(None, 96)
+        # Positions are worked out by the layout, once per screen size.
+        self.layout = Layout()
+        buttons = self.layout.stack("center", (0, 30), spacing=20)
+        self.play_button = buttons.add(Button(0, 0, 240, 60, "PLAY", 42, 
+                                              sound_file='assets/play_click.wav',
+                                              color_scheme=COLOR_SCHEMES["EASY"]))
+        self.difficulty_button = buttons.add(Button(0, 0, 240, 60, f"AI: {self.difficulty}", 42,
+                                                    sound_file='assets/settings_menu_click.wav',
+                                                    color_scheme=COLOR_SCHEMES["EASY"]))
+        self.settings_button = buttons.add(Button(0, 0, 240, 60, "SETTINGS", 42,
+                                                  sound_file='assets/settings_click.wav',
+                                                  color_scheme=COLOR_SCHEMES["EASY"]))
+        self.quit_button = buttons.add(Button(0, 0, 240, 60, "QUIT", 42,
+                                              sound_file='assets/settings_menu_click.wav',
+                                              color_scheme=COLOR_SCHEMES["EASY"]))
+        
+        
+        self.bug_report_button = self.layout.anchor(
+            Button(0, 0, 50, 50, "", font_size=36, 
+                   sound_file='assets/settings_menu_click.wav',
+                   color_scheme=COLOR_SCHEMES["EASY"],
+                   icon="?"),
+            "bottomright", (-20, -20))
+        
+        
+        corner = self.layout.stack("bottomleft", (20, -20), spacing=10, vertical=False)
+        self.info_button = corner.add(Button(0, 0, 50, 50, "", font_size=36, 
+                                             sound_file='assets/settings_menu_click.wav',
+                                             color_scheme=COLOR_SCHEMES["EASY"],
+                                             icon="i"))
+        self.trophy_button = corner.add(Button(0, 0, 50, 50, "", font_size=36, 
+                                               sound_file='assets/settings_menu_click.wav',
+                                               color_scheme=COLOR_SCHEMES["EASY"],
+                                               icon="L"))
+        self.layout.resize(self.width, self.height)
+        
+        self.title_font = get_font(96)
+        self.profiler_font = get_font(22)
         
         self.color_transition_progress = 0
         self.current_color_scheme = COLOR_SCHEMES["EASY"]
@@ -798,228 +881,139 @@ class Menu:
         b = int(b1 + (b2 - b1) * eased_progress)
         return (r, g, b)
         
-    def run_settings_menu(self):
-        
-        settings_menu = SettingsMenu(self.screen, self.settings, self.target_color_scheme)
-        return settings_menu.run()
+    def run(self):
+        while True:
+            result = self.frame(coalesce_motion(pygame.event.get()))
+            if result is not None:
+                return result
+            
+            present_start = profiler.begin()
+            pygame.display.flip()
+            profiler.end("present", present_start)
+            profiler.frame_done()
+
+    def frame(self, events, frame_time=None):
+        """Draws one menu frame and handles events. Returns the menu's
+        result, such as "quit", "game:easy" or the name of a submenu to
+        open ("settings", "bug_report", "info", "scores"), or None to keep
+        going."""
+        self.width = self.screen.get_width()
+        self.height = self.screen.get_height()
+        
+        draw_start = profiler.begin()
+        self.update_color_transition()
+        
+        gradient_cache.draw(
+            self.screen,
+            self.current_color_scheme["background"],
+            self.target_color_scheme["background"],
+            self.color_transition_progress
+        )
         
-    def run_bug_report_menu(self):
+        title_shadow = text_cache.render(self.title_font, "mit's ping bang", True, (200, 200, 200))
+        title = text_cache.render(self.title_font, "• PING BANG •", True, (0, 0, 0))
         
-        bug_report_menu = BugReportMenu(self.screen, self.target_color_scheme)
-        return bug_report_menu.run()
+        title_rect = title.get_rect(centerx=self.width // 2, centery=self.height // 5)
         
-    def run_info_menu(self):
+        for offset in range(4, 0, -1):
+            shadow_rect = title_rect.copy()
+            shadow_rect.x += offset
+            shadow_rect.y += offset
+            shadow = text_cache.render(self.title_font, "• PING BANG •", True, 
+                                          (220 - offset*10, 220 - offset*10, 220 - offset*10))
+            self.screen.blit(shadow, shadow_rect)
         
-        info_menu = InfoMenu(self.screen, self.target_color_scheme)
-        return info_menu.run()
+        self.screen.blit(title, title_rect)
         
-    def run_global_scores_menu(self, score=None):
+        self.layout.resize(self.width, self.height)
+        self.layout.draw(self.screen)
         
-        global_scores_menu = GlobalScoresMenu(self.screen, self.target_color_scheme, score)
-        return global_scores_menu.run()
+        mouse_pos = pygame.mouse.get_pos()
+        self.cursor.draw(self.screen, mouse_pos)
+        profiler.draw_overlay(self.screen, self.profiler_font)
+        profiler.end("draw", draw_start)
         
-    def run(self):
-        while True:
-            self.width = self.screen.get_width()
-            self.height = self.screen.get_height()
-            
-            self.update_color_transition()
-            
-            bg_start = self.interpolate_color(
-                self.current_color_scheme["background"][0],
-                self.target_color_scheme["background"][0],
-                self.color_transition_progress
-            )
-            bg_end = self.interpolate_color(
-                self.current_color_scheme["background"][1],
-                self.target_color_scheme["background"][1],
-                self.color_transition_progress
-            )
-            
-            self.screen.fill(bg_start)
-            gradient_steps = 12
-            step_height = self.height / gradient_steps
-            
-            for i in range(gradient_steps):
-                r = int(bg_start[0] + (bg_end[0] - bg_start[0]) * (i / gradient_steps))
-                g = int(bg_start[1] + (bg_end[1] - bg_start[1]) * (i / gradient_steps))
-                b = int(bg_start[2] + (bg_end[2] - bg_start[2]) * (i / gradient_steps))
-                color = (r, g, b)
-                pygame.draw.rect(self.screen, color,
-                               (0, i * step_height, self.width, step_height + 1))
-            
-            title_shadow = self.title_font.render("mit's ping bang", True, (200, 200, 200))
-            title = self.title_font.render("• PING BANG •", True, (0, 0, 0))
-            
-            title_rect = title.get_rect(centerx=self.width // 2, centery=self.height // 5)
-            
-            for offset in range(4, 0, -1):
-                shadow_rect = title_rect.copy()
-                shadow_rect.x += offset
-                shadow_rect.y += offset
-                shadow = self.title_font.render("• PING BANG •", True, 
-                                              (220 - offset*10, 220 - offset*10, 220 - offset*10))
-                self.screen.blit(shadow, shadow_rect)
-            
-            self.screen.blit(title, title_rect)
-            
-            button_width = 240
-            button_height = 60
-            vertical_spacing = 80
-            start_y = self.height // 2 + 40
-            button_x = self.width // 2 - button_width // 2
-            
-            self.play_button.original_rect.x = button_x
-            self.play_button.original_rect.y = start_y - vertical_spacing * 2
-            self.play_button.rect.x = button_x
-            self.play_button.rect.y = start_y - vertical_spacing * 2
-            
-            self.difficulty_button.original_rect.x = button_x
-            self.difficulty_button.original_rect.y = start_y - vertical_spacing
-            self.difficulty_button.rect.x = button_x
-            self.difficulty_button.rect.y = start_y - vertical_spacing
-            
-            self.settings_button.original_rect.x = button_x
-            self.settings_button.original_rect.y = start_y
-            self.settings_button.rect.x = button_x
-            self.settings_button.rect.y = start_y
-            
-            self.quit_button.original_rect.x = button_x
-            self.quit_button.original_rect.y = start_y + vertical_spacing
-            self.quit_button.rect.x = button_x
-            self.quit_button.rect.y = start_y + vertical_spacing
-            
-            
-            bug_button_size = 50
-            bug_button_x = self.width - bug_button_size - 20
-            bug_button_y = self.height - bug_button_size - 20
-            
-            self.bug_report_button.original_rect.x = bug_button_x
-            self.bug_report_button.original_rect.y = bug_button_y
-            self.bug_report_button.rect.x = bug_button_x
-            self.bug_report_button.rect.y = bug_button_y
-            
-            
-            info_button_size = 50
-            info_button_x = 20
-            info_button_y = self.height - info_button_size - 20
-            
-            self.info_button.original_rect.x = info_button_x
-            self.info_button.original_rect.y = info_button_y
-            self.info_button.rect.x = info_button_x
-            self.info_button.rect.y = info_button_y
-            
-            
-            trophy_button_size = 50
-            trophy_button_x = info_button_x + trophy_button_size + 10
-            trophy_button_y = info_button_y
-            
-            self.trophy_button.original_rect.x = trophy_button_x
-            self.trophy_button.original_rect.y = trophy_button_y
-            self.trophy_button.rect.x = trophy_button_x
-            self.trophy_button.rect.y = trophy_button_y
-            
-            self.play_button.draw(self.screen)
-            self.difficulty_button.draw(self.screen)
-            self.settings_button.draw(self.screen)
-            self.quit_button.draw(self.screen)
-            self.bug_report_button.draw(self.screen)
-            self.info_button.draw(self.screen)
-            self.trophy_button.draw(self.screen)
-            
-            mouse_pos = pygame.mouse.get_pos()
-            self.cursor.draw(self.screen, mouse_pos)
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "quit"
-                    
-                if self.play_button.handle_event(event):
-                    return f"game:{self.difficulty.lower()}"
-                if self.difficulty_button.handle_event(event):
-                    if self.difficulty == "EASY":
-                        self.difficulty = "MEDIUM"
-                        
-                        try:
-                            pygame.mixer.music.load('assets/medium_music.wav')
-                            pygame.mixer.music.play(-1)
-                            if self.settings.current_settings['music_enabled']:
-                                pygame.mixer.music.set_volume(1.0)  
-                            else:
-                                pygame.mixer.music.set_volume(0.0)
-                        except:
-                            print("Medium difficulty music file not found")
-                    elif self.difficulty == "MEDIUM":
-                        self.difficulty = "HARD"
-                        
-                        try:
-                            pygame.mixer.music.load('assets/hard_music.wav')
-                            pygame.mixer.music.play(-1)
-                            if self.settings.current_settings['music_enabled']:
-                                pygame.mixer.music.set_volume(1.0)  
-                            else:
-                                pygame.mixer.music.set_volume(0.0)
-                        except:
-                            print("Hard difficulty music file not found")
-                    else:
-                        self.difficulty = "EASY"
-                        
-                        try:
-                            pygame.mixer.music.load('assets/background_music.wav')
-                            pygame.mixer.music.play(-1)
-                            if self.settings.current_settings['music_enabled']:
-                                pygame.mixer.music.set_volume(1.0)  
-                            else:
-                                pygame.mixer.music.set_volume(0.0)
-                        except:
-                            print("Easy difficulty music file not found")
-                    self.difficulty_button.text = f"AI: {self.difficulty}"
-                    
-                    
-                    self.target_color_scheme = COLOR_SCHEMES[self.difficulty]
-                    self.color_transition_progress = 0  
-                    
-                    
-                    self.play_button.set_color_scheme(COLOR_SCHEMES[self.difficulty])
-                    self.difficulty_button.set_color_scheme(COLOR_SCHEMES[self.difficulty])
-                    self.settings_button.set_color_scheme(COLOR_SCHEMES[self.difficulty])
-                    self.quit_button.set_color_scheme(COLOR_SCHEMES[self.difficulty])
-                    self.bug_report_button.set_color_scheme(COLOR_SCHEMES[self.difficulty])
-                    self.info_button.set_color_scheme(COLOR_SCHEMES[self.difficulty])
-                    self.trophy_button.set_color_scheme(COLOR_SCHEMES[self.difficulty])
-                    
-                if self.settings_button.handle_event(event):
-                    result = self.run_settings_menu()
-                    if result == "fullscreen_toggle":
-                        
-                        pygame.display.toggle_fullscreen()
-                        
-                        self.width = self.screen.get_width()
-                        self.height = self.screen.get_height()
-                    elif result == "back":
-                        continue
-                        
-                if self.bug_report_button.handle_event(event):
-                    result = self.run_bug_report_menu()
-                    if result == "back":
-                        continue
+        # The events are handled in their own method so the input span is
+        # closed on the frames that leave the menu, too.
+        input_start = profiler.begin()
+        result = self.handle_events(events)
+        profiler.end("input", input_start)
+        return result
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.QUIT:
+                return "quit"
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+                
+            clicked = self.layout.handle_event(event)
+            if clicked is self.play_button:
+                return f"game:{self.difficulty.lower()}"
+            if clicked is self.difficulty_button:
+                if self.difficulty == "EASY":
+                    self.difficulty = "MEDIUM"
                     
-                if self.info_button.handle_event(event):
-                    result = self.run_info_menu()
-                    if result == "back":
-                        continue
+                    try:
+                        pygame.mixer.music.load('assets/medium_music.wav')
+                        pygame.mixer.music.play(-1)
+                        if self.settings.current_settings['music_enabled']:
+                            pygame.mixer.music.set_volume(1.0)  
+                        else:
+                            pygame.mixer.music.set_volume(0.0)
+                    except:
+                        print("Medium difficulty music file not found")
+                elif self.difficulty == "MEDIUM":
+                    self.difficulty = "HARD"
                     
-                if self.trophy_button.handle_event(event):
-                    result = self.run_global_scores_menu()
-                    if result == "back":
-                        continue
+                    try:
+                        pygame.mixer.music.load('assets/hard_music.wav')
+                        pygame.mixer.music.play(-1)
+                        if self.settings.current_settings['music_enabled']:
+                            pygame.mixer.music.set_volume(1.0)  
+                        else:
+                            pygame.mixer.music.set_volume(0.0)
+                    except:
+                        print("Hard difficulty music file not found")
+                else:
+                    self.difficulty = "EASY"
                     
-                if self.quit_button.handle_event(event):
-                    return "quit"
+                    try:
+                        pygame.mixer.music.load('assets/background_music.wav')
+                        pygame.mixer.music.play(-1)
+                        if self.settings.current_settings['music_enabled']:
+                            pygame.mixer.music.set_volume(1.0)  
+                        else:
+                            pygame.mixer.music.set_volume(0.0)
+                    except:
+                        print("Easy difficulty music file not found")
+                self.difficulty_button.text = f"AI: {self.difficulty}"
+                
+                
+                self.target_color_scheme = COLOR_SCHEMES[self.difficulty]
+                self.color_transition_progress = 0  
+                
+                
+                for button in self.layout.widgets:
+                    button.set_color_scheme(COLOR_SCHEMES[self.difficulty])
+                
+            if clicked is self.settings_button:
+                return "settings"
                     
-            pygame.display.flip()
+            if clicked is self.bug_report_button:
+                return "bug_report"
+                
+            if clicked is self.info_button:
+                return "info"
+                
+            if clicked is self.trophy_button:
+                return "scores"
+                
+            if clicked is self.quit_button:
+                return "quit"
+        return None
 
-class SettingsMenu:
+class SettingsMenu(Scene):
     def __init__(self, screen, settings, color_scheme=None):
         self.screen = screen
         self.settings = settings
@@ -1030,133 +1024,93 @@ class SettingsMenu:
         
         self.color_scheme = color_scheme or COLOR_SCHEMES["EASY"]
         
-        button_width = 300
-        button_height = 60
-        vertical_spacing = 80
-        start_y = self.height // 2 + 40
-        button_x = self.width // 2 - button_width // 2
-        
-        self.fullscreen_button = Button(button_x, start_y - vertical_spacing * 2,
-                                      button_width, button_height,
-                                      f"FULLSCREEN: {'ON' if self.settings.current_settings['fullscreen'] else 'OFF'}", 42,
-                                      sound_file='assets/settings_menu_click.wav',
-                                      color_scheme=self.color_scheme)
-        
-        self.music_button = Button(button_x, start_y - vertical_spacing,
-                                 button_width, button_height,
-                                 f"MUSIC: {'ON' if self.settings.current_settings['music_enabled'] else 'OFF'}", 42,
-                                 sound_file='assets/settings_menu_click.wav',
-                                 color_scheme=self.color_scheme)
-        
-        self.antialiasing_button = Button(button_x, start_y,
-                                        button_width, button_height,
-                                        f"ANTIALIASING: {'ON' if self.settings.current_settings['antialiasing_enabled'] else 'OFF'}", 42,
-                                        sound_file='assets/settings_menu_click.wav',
-                                        color_scheme=self.color_scheme)
-        
-        self.back_button = Button(button_x, start_y + vertical_spacing * 2,
-                                button_width, button_height, "BACK", 42,
-                                sound_file='assets/settings_menu_click.wav',
-                                color_scheme=self.color_scheme)
-        
-        self.title_font = pygame.font.Font(None, 96)
+        self.layout = Layout()
+        buttons = self.layout.stack("center", (0, 70), spacing=20)
+        self.fullscreen_button = buttons.add(Button(0, 0, 300, 60,
+                                                    f"FULLSCREEN: {'ON' if self.settings.current_settings['fullscreen'] else 'OFF'}", 42,
+                                                    sound_file='assets/settings_menu_click.wav',
+                                                    color_scheme=self.color_scheme))
         
-    def run(self):
-        while True:
-            self.width = self.screen.get_width()
-            self.height = self.screen.get_height()
-            
-            bg_start, bg_end = self.color_scheme["background"]
-            self.screen.fill(bg_start)
-            gradient_steps = 12
-            step_height = self.height / gradient_steps
-            
-            for i in range(gradient_steps):
-                r = int(bg_start[0] + (bg_end[0] - bg_start[0]) * (i / gradient_steps))
-                g = int(bg_start[1] + (bg_end[1] - bg_start[1]) * (i / gradient_steps))
-                b = int(bg_start[2] + (bg_end[2] - bg_start[2]) * (i / gradient_steps))
-                color = (r, g, b)
-                pygame.draw.rect(self.screen, color,
-                               (0, i * step_height, self.width, step_height + 1))
-            
-            title = self.title_font.render("SETTINGS", True, self.color_scheme["text"])
-            
-            title_rect = title.get_rect(centerx=self.width // 2, centery=self.height // 5)
-            
-            for offset in range(4, 0, -1):
-                shadow_rect = title_rect.copy()
-                shadow_rect.x += offset
-                shadow_rect.y += offset
-                shadow = self.title_font.render("SETTINGS", True, 
-                                              (220 - offset*10, 220 - offset*10, 220 - offset*10))
-                self.screen.blit(shadow, shadow_rect)
-            
-            self.screen.blit(title, title_rect)
-            
-            button_width = 300
-            button_height = 60
-            vertical_spacing = 80
-            start_y = self.height // 2 + 40
-            button_x = self.width // 2 - button_width // 2
-            
-            self.fullscreen_button.original_rect.x = button_x
-            self.fullscreen_button.original_rect.y = start_y - vertical_spacing * 2
-            self.fullscreen_button.rect.x = button_x
-            self.fullscreen_button.rect.y = start_y - vertical_spacing * 2
-            
-            self.music_button.original_rect.x = button_x
-            self.music_button.original_rect.y = start_y - vertical_spacing
-            self.music_button.rect.x = button_x
-            self.music_button.rect.y = start_y - vertical_spacing
-            
-            self.antialiasing_button.original_rect.x = button_x
-            self.antialiasing_button.original_rect.y = start_y
-            self.antialiasing_button.rect.x = button_x
-            self.antialiasing_button.rect.y = start_y
-            
-            self.back_button.original_rect.x = button_x
-            self.back_button.original_rect.y = start_y + vertical_spacing * 2
-            self.back_button.rect.x = button_x
-            self.back_button.rect.y = start_y + vertical_spacing * 2
-            
-            self.fullscreen_button.draw(self.screen)
-            self.music_button.draw(self.screen)
-            self.antialiasing_button.draw(self.screen)
-            self.back_button.draw(self.screen)
-            
-            mouse_pos = pygame.mouse.get_pos()
-            self.cursor.draw(self.screen, mouse_pos)
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "quit"
-                    
-                if self.fullscreen_button.handle_event(event):
-                    current_state = self.settings.current_settings['fullscreen']
-                    self.settings.update_setting('fullscreen', not current_state)
-                    self.fullscreen_button.text = f"FULLSCREEN: {'ON' if not current_state else 'OFF'}"
-                    return "fullscreen_toggle"
+        self.music_button = buttons.add(Button(0, 0, 300, 60,
+                                               f"MUSIC: {'ON' if self.settings.current_settings['music_enabled'] else 'OFF'}", 42,
+                                               sound_file='assets/settings_menu_click.wav',
+                                               color_scheme=self.color_scheme))
+        
+        self.antialiasing_button = buttons.add(Button(0, 0, 300, 60,
+                                                      f"ANTIALIASING: {'ON' if self.settings.current_settings['antialiasing_enabled'] else 'OFF'}", 42,
+                                                      sound_file='assets/settings_menu_click.wav',
+                                                      color_scheme=self.color_scheme))
+        
+        buttons.add_space(60)
+        self.back_button = buttons.add(Button(0, 0, 300, 60, "BACK", 42,
+                                              sound_file='assets/settings_menu_click.wav',
+                                              color_scheme=self.color_scheme))
+        self.layout.resize(self.width, self.height)
+        
+        self.title_font = get_font(96)
+        
+    def enter(self, color_scheme=None):
+        if color_scheme is not None:
+            self.color_scheme = color_scheme
+        for button in self.layout.widgets:
+            button.reset(self.color_scheme)
+        
+        current = self.settings.current_settings
+        self.fullscreen_button.text = f"FULLSCREEN: {'ON' if current['fullscreen'] else 'OFF'}"
+        self.music_button.text = f"MUSIC: {'ON' if current['music_enabled'] else 'OFF'}"
+        self.antialiasing_button.text = f"ANTIALIASING: {'ON' if current['antialiasing_enabled'] else 'OFF'}"
+        
+    def frame(self, events, frame_time=None):
+        self.width = self.screen.get_width()
+        self.height = self.screen.get_height()
+        
+        gradient_cache.draw(self.screen, self.color_scheme["background"])
+        
+        title = text_cache.render(self.title_font, "SETTINGS", True, self.color_scheme["text"])
+        
+        title_rect = title.get_rect(centerx=self.width // 2, centery=self.height // 5)
+        
+        for offset in range(4, 0, -1):
+            shadow_rect = title_rect.copy()
+            shadow_rect.x += offset
+            shadow_rect.y += offset
+            shadow = text_cache.render(self.title_font, "SETTINGS", True, 
+                                          (220 - offset*10, 220 - offset*10, 220 - offset*10))
+            self.screen.blit(shadow, shadow_rect)
+        
+        self.screen.blit(title, title_rect)
+        
+        self.layout.resize(self.width, self.height)
+        self.layout.draw(self.screen)
+        
+        mouse_pos = pygame.mouse.get_pos()
+        self.cursor.draw(self.screen, mouse_pos)
+        
+        for event in events:
+            if event.type == pygame.QUIT:
+                return "quit"
                 
-                if self.music_button.handle_event(event):
-                    current_state = self.settings.current_settings['music_enabled']
-                    self.settings.update_setting('music_enabled', not current_state)
-                    self.music_button.text = f"MUSIC: {'ON' if not current_state else 'OFF'}"
-                    if not current_state:
-                        pygame.mixer.music.set_volume(1.0)
-                    else:
-                        pygame.mixer.music.set_volume(0.0)
+            clicked = self.layout.handle_event(event)
+            if clicked is self.fullscreen_button:
+                current_state = self.settings.current_settings['fullscreen']
+                self.settings.update_setting('fullscreen', not current_state)
+                self.fullscreen_button.text = f"FULLSCREEN: {'ON' if not current_state else 'OFF'}"
+            
+            if clicked is self.music_button:
+                current_state = self.settings.current_settings['music_enabled']
+                self.settings.update_setting('music_enabled', not current_state)
+                self.music_button.text = f"MUSIC: {'ON' if not current_state else 'OFF'}"
+            
+            if clicked is self.antialiasing_button:
+                current_state = self.settings.current_settings['antialiasing_enabled']
+                self.settings.update_setting('antialiasing_enabled', not current_state)
+                self.antialiasing_button.text = f"ANTIALIASING: {'ON' if not current_state else 'OFF'}"
                 
-                if self.antialiasing_button.handle_event(event):
-                    current_state = self.settings.current_settings['antialiasing_enabled']
-                    self.settings.update_setting('antialiasing_enabled', not current_state)
-                    self.antialiasing_button.text = f"ANTIALIASING: {'ON' if not current_state else 'OFF'}"
-                    
-                if self.back_button.handle_event(event):
-                    return "back"
-                    
-            pygame.display.flip() 
+            if clicked is self.back_button:
+                return "back"
+        return None
 
-class InfoMenu:
+class InfoMenu(Scene):
     def __init__(self, screen, color_scheme=None):
         self.screen = screen
         self.width = screen.get_width()
@@ -1167,44 +1121,27 @@ class InfoMenu:
         self.color_scheme = color_scheme or COLOR_SCHEMES["EASY"]
         
         
-        box_width = 500
-        box_height = 300
-        box_x = (self.width - box_width) // 2
-        box_y = (self.height - box_height) // 2
+        # A 500x300 box in the middle of the screen, with the link buttons
+        # along its bottom edge and BACK just below it.
+        self.box_rect = pygame.Rect(0, 0, 500, 300)
+        self.box_rect.center = (self.width // 2, self.height // 2)
         
-        self.box_rect = pygame.Rect(box_x, box_y, box_width, box_height)
+        self.layout = Layout()
+        links = self.layout.stack("center", (0, 110), spacing=20, vertical=False)
+        self.github_button = links.add(Button(0, 0, 150, 40, "GITHUB", 28,
+                                              sound_file='assets/settings_menu_click.wav',
+                                              color_scheme=self.color_scheme))
+        self.source_button = links.add(Button(0, 0, 150, 40, "SOURCE", 28,
+                                              sound_file='assets/settings_menu_click.wav',
+                                              color_scheme=self.color_scheme))
+        self.back_button = self.layout.anchor(Button(0, 0, 150, 40, "BACK", 32,
+                                                     sound_file='assets/settings_menu_click.wav',
+                                                     color_scheme=self.color_scheme),
+                                              "center", (0, 190))
+        self.layout.resize(self.width, self.height)
         
-        
-        button_width = 150
-        button_height = 40
-        button_spacing = 20
-        
-        self.github_button = Button(
-            box_x + box_width // 2 - button_width - button_spacing // 2,
-            box_y + box_height - button_height - 20,
-            button_width, button_height, "GITHUB", 28,
-            sound_file='assets/settings_menu_click.wav',
-            color_scheme=self.color_scheme
-        )
-        
-        self.source_button = Button(
-            box_x + box_width // 2 + button_spacing // 2,
-            box_y + box_height - button_height - 20,
-            button_width, button_height, "SOURCE", 28,
-            sound_file='assets/settings_menu_click.wav',
-            color_scheme=self.color_scheme
-        )
-        
-        self.back_button = Button(
-            box_x + (box_width - button_width) // 2,
-            box_y + box_height + 20,
-            button_width, button_height, "BACK", 32,
-            sound_file='assets/settings_menu_click.wav',
-            color_scheme=self.color_scheme
-        )
-        
-        self.title_font = pygame.font.Font(None, 64)
-        self.text_font = pygame.font.Font(None, 32)
+        self.title_font = get_font(64)
+        self.text_font = get_font(32)
         
         
         self.description_text = "a little fun ping pong game made in a few hours for fun, this game is open source so feel free to make your own version of it!"
@@ -1220,9 +1157,8 @@ class InfoMenu:
         for word in words:
             
             test_line = ' '.join(current_line + [word])
-            text_surface = font.render(test_line, True, self.color_scheme["text"])
             
-            if text_surface.get_width() <= max_width:
+            if font.size(test_line)[0] <= max_width:
                 current_line.append(word)
             else:
                 if current_line:
@@ -1234,185 +1170,300 @@ class InfoMenu:
             
         return lines
         
-    def run(self):
-        while True:
-            self.width = self.screen.get_width()
-            self.height = self.screen.get_height()
-            
-            
-            bg_start, bg_end = self.color_scheme["background"]
-            self.screen.fill(bg_start)
-            gradient_steps = 12
-            step_height = self.height / gradient_steps
-            
-            for i in range(gradient_steps):
-                r = int(bg_start[0] + (bg_end[0] - bg_start[0]) * (i / gradient_steps))
-                g = int(bg_start[1] + (bg_end[1] - bg_start[1]) * (i / gradient_steps))
-                b = int(bg_start[2] + (bg_end[2] - bg_start[2]) * (i / gradient_steps))
-                color = (r, g, b)
-                pygame.draw.rect(self.screen, color,
-                               (0, i * step_height, self.width, step_height + 1))
-            
-            
-            shadow_offset = 10
-            shadow_rect = self.box_rect.copy()
-            shadow_rect.x += shadow_offset
-            shadow_rect.y += shadow_offset
-            pygame.draw.rect(self.screen, (50, 50, 50), shadow_rect, border_radius=15)
-            
-            
-            box_bg_color = (240, 240, 240) if self.color_scheme == COLOR_SCHEMES["HARD"] else (255, 255, 255)
-            pygame.draw.rect(self.screen, box_bg_color, self.box_rect, border_radius=15)
-            pygame.draw.rect(self.screen, self.color_scheme["button_border"], self.box_rect, border_radius=15, width=2)
-            
-            
-            title_color = (180, 30, 50) if self.color_scheme == COLOR_SCHEMES["HARD"] else self.color_scheme["text"]
-            title = self.title_font.render("Ping Bang!", True, title_color)
-            title_rect = title.get_rect(centerx=self.width // 2, centery=self.box_rect.y + 50)
-            
-            
-            shadow_color = (100, 0, 20) if self.color_scheme == COLOR_SCHEMES["HARD"] else (220, 220, 220)
-            for offset in range(4, 0, -1):
-                shadow_rect = title_rect.copy()
-                shadow_rect.x += offset
-                shadow_rect.y += offset
-                shadow = self.title_font.render("Ping Bang!", True, shadow_color)
-                self.screen.blit(shadow, shadow_rect)
-            
-            self.screen.blit(title, title_rect)
-            
-            
-            available_width = self.box_rect.width - (2 * self.text_margin)
-            
-            
-            wrapped_lines = self.wrap_text(self.description_text, self.text_font, available_width)
-            
-            
-            line_height = self.text_font.get_height() + self.line_spacing
-            total_text_height = len(wrapped_lines) * line_height
-            start_y = self.box_rect.y + 100
-            
-            text_color = (40, 40, 40) if self.color_scheme == COLOR_SCHEMES["HARD"] else self.color_scheme["text"]
-            for i, line in enumerate(wrapped_lines):
-                text_surface = self.text_font.render(line, True, text_color)
-                text_rect = text_surface.get_rect(
-                    centerx=self.width // 2,
-                    y=start_y + (i * line_height)
-                )
-                self.screen.blit(text_surface, text_rect)
-            
-            
-            self.github_button.draw(self.screen)
-            self.source_button.draw(self.screen)
-            self.back_button.draw(self.screen)
-            
-            
-            mouse_pos = pygame.mouse.get_pos()
-            self.cursor.draw(self.screen, mouse_pos)
-            
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "quit"
-                    
-                if self.github_button.handle_event(event):
-                    
-                    import webbrowser
-                    webbrowser.open("https://github.com/TheDerpyMit")
-                    return "back"
-                    
-                if self.source_button.handle_event(event):
-                    
-                    import webbrowser
-                    webbrowser.open("https://github.com/TheDerpyMit/ping-bang")
-                    return "back"
-                    
-                if self.back_button.handle_event(event):
-                    return "back"
-                    
-            pygame.display.flip() 
+    def enter(self, color_scheme=None):
+        if color_scheme is not None:
+            self.color_scheme = color_scheme
+        for button in self.layout.widgets:
+            button.reset(self.color_scheme)
+        
+    def frame(self, events, frame_time=None):
+        self.width = self.screen.get_width()
+        self.height = self.screen.get_height()
+        
+        
+        gradient_cache.draw(self.screen, self.color_scheme["background"])
+        self.layout.resize(self.width, self.height)
+        self.box_rect.center = (self.width // 2, self.height // 2)
+        
+        
+        shadow_offset = 10
+        shadow_rect = self.box_rect.copy()
+        shadow_rect.x += shadow_offset
+        shadow_rect.y += shadow_offset
+        pygame.draw.rect(self.screen, (50, 50, 50), shadow_rect, border_radius=15)
+        
+        
+        box_bg_color = (240, 240, 240) if self.color_scheme == COLOR_SCHEMES["HARD"] else (255, 255, 255)
+        pygame.draw.rect(self.screen, box_bg_color, self.box_rect, border_radius=15)
+        pygame.draw.rect(self.screen, self.color_scheme["button_border"], self.box_rect, border_radius=15, width=2)
+        
+        
+        title_color = (180, 30, 50) if self.color_scheme == COLOR_SCHEMES["HARD"] else self.color_scheme["text"]
+        title = text_cache.render(self.title_font, "Ping Bang!", True, title_color)
+        title_rect = title.get_rect(centerx=self.width // 2, centery=self.box_rect.y + 50)
+        
+        
+        shadow_color = (100, 0, 20) if self.color_scheme == COLOR_SCHEMES["HARD"] else (220, 220, 220)
+        for offset in range(4, 0, -1):
+            shadow_rect = title_rect.copy()
+            shadow_rect.x += offset
+            shadow_rect.y += offset
+            shadow = text_cache.render(self.title_font, "Ping Bang!", True, shadow_color)
+            self.screen.blit(shadow, shadow_rect)
+        
+        self.screen.blit(title, title_rect)
+        
+        
+        available_width = self.box_rect.width - (2 * self.text_margin)
+        
+        
+        wrapped_lines = self.wrap_text(self.description_text, self.text_font, available_width)
+        
+        
+        line_height = self.text_font.get_height() + self.line_spacing
+        total_text_height = len(wrapped_lines) * line_height
+        start_y = self.box_rect.y + 100
+        
+        text_color = (40, 40, 40) if self.color_scheme == COLOR_SCHEMES["HARD"] else self.color_scheme["text"]
+        for i, line in enumerate(wrapped_lines):
+            text_surface = text_cache.render(self.text_font, line, True, text_color)
+            text_rect = text_surface.get_rect(
+                centerx=self.width // 2,
+                y=start_y + (i * line_height)
+            )
+            self.screen.blit(text_surface, text_rect)
+        
+        
+        self.layout.draw(self.screen)
+        
+        
+        mouse_pos = pygame.mouse.get_pos()
+        self.cursor.draw(self.screen, mouse_pos)
+        
+        
+        for event in events:
+            if event.type == pygame.QUIT:
+                return "quit"
+                
+            clicked = self.layout.handle_event(event)
+            if clicked is self.github_button:
+                
+                import webbrowser
+                webbrowser.open("https://github.com/TheDerpyMit")
+                return "back"
+                
+            if clicked is self.source_button:
+                
+                import webbrowser
+                webbrowser.open("https://github.com/TheDerpyMit/ping-bang")
+                return "back"
+                
+            if clicked is self.back_button:
+                return "back"
+        return None
 
-class GlobalScoresMenu:
-    def __init__(self, screen, color_scheme=None, score_to_submit=None):
+class GlobalScoresMenu(Scene):
+    def __init__(self, screen, color_scheme=None, score_to_submit=None, difficulty="easy"):
         self.screen = screen
         self.width = screen.get_width()
         self.height = screen.get_height()
         self.cursor = CustomCursor()
+        self.store = get_score_store()
+        self.settings = get_settings()
         
         
         self.color_scheme = color_scheme or COLOR_SCHEMES["EASY"]
+        self.score_to_submit = score_to_submit
+        self.difficulty = difficulty
+        self.page_size = 10
+        self.page_starts = [None]
+        self.rows = []
+        self.has_next_page = False
+        self.highlight_id = None
+        
+        
+        self.box_rect = pygame.Rect(0, 0, 800, 460)
+        self.box_rect.center = (self.width // 2, self.height // 2)
+        
+        # The list of scores and the name entry each have their own layout,
+        # so only the widgets on show get events. BACK is in both.
+        self.back_button = Button(0, 0, 150, 40, "BACK", 28,
+                                  sound_file='assets/settings_menu_click.wav',
+                                  color_scheme=self.color_scheme)
+        
+        self.list_layout = Layout()
+        bottom = self.list_layout.stack("center", (0, 190), spacing=155, vertical=False)
+        self.prev_button = bottom.add(Button(0, 0, 150, 40, "PREV", 28,
+                                             sound_file='assets/settings_menu_click.wav',
+                                             color_scheme=self.color_scheme))
+        bottom.add(self.back_button)
+        self.next_button = bottom.add(Button(0, 0, 150, 40, "NEXT", 28,
+                                             sound_file='assets/settings_menu_click.wav',
+                                             color_scheme=self.color_scheme))
+        self.difficulty_button = self.list_layout.anchor(
+            Button(0, 0, 200, 40, f"MODE: {self.difficulty.upper()}", 28,
+                   sound_file='assets/settings_menu_click.wav',
+                   color_scheme=self.color_scheme),
+            "center", (280, -180))
+        
+        self.entry_layout = Layout()
+        self.name_box = self.entry_layout.anchor(
+            TextBox(0, 0, 500, 50, font_size=32, color_scheme=self.color_scheme, max_chars=16),
+            "center", (0, -5))
+        self.name_box.placeholder_text = "Enter your name..."
+        self.name_box.update_wrapped_lines()
+        self.name_box.active = True
+        self.submit_button = self.entry_layout.anchor(
+            Button(0, 0, 150, 40, "SUBMIT", 28,
+                   sound_file='assets/settings_menu_click.wav',
+                   color_scheme=self.color_scheme),
+            "center", (0, 80))
+        self.entry_layout.anchor(self.back_button, "center", (0, 190))
+        self.list_layout.resize(self.width, self.height)
+        self.entry_layout.resize(self.width, self.height)
+        
+        self.title_font = get_font(64)
+        self.text_font = get_font(32)
+        
+        self.load_page()
+        
+    def enter(self, color_scheme=None, score_to_submit=None, difficulty=None):
+        if color_scheme is not None:
+            self.color_scheme = color_scheme
+            self.name_box.set_color_scheme(color_scheme)
+        for button in (self.back_button, self.prev_button, self.next_button,
+                       self.difficulty_button, self.submit_button):
+            button.reset(self.color_scheme)
+        
+        self.score_to_submit = score_to_submit
+        self.highlight_id = None
+        self.name_box.active = score_to_submit is not None
+        # The name box takes typing straight away, without a click first.
+        self.entry_layout.focused = self.name_box if self.name_box.active else None
+        self.set_difficulty(difficulty or self.difficulty)
+        
+    def load_page(self):
+        rows = self.store.top(self.difficulty, self.page_size + 1, self.page_starts[-1])
+        self.has_next_page = len(rows) > self.page_size
+        self.rows = rows[:self.page_size]
+        
+    def next_page(self):
+        if not self.has_next_page:
+            return
+        last_id, _, last_score, _ = self.rows[-1]
+        self.page_starts.append((last_score, last_id))
+        self.load_page()
+        
+    def previous_page(self):
+        if len(self.page_starts) > 1:
+            self.page_starts.pop()
+            self.load_page()
+            
+    def set_difficulty(self, difficulty):
+        self.difficulty = difficulty
+        self.difficulty_button.text = f"MODE: {difficulty.upper()}"
+        self.page_starts = [None]
+        self.load_page()
+        
+    def submit_score(self):
+        name = self.name_box.get_text().strip() or "Player"
+        self.highlight_id = self.store.add(name, self.score_to_submit, self.difficulty)
+        self.settings.update_setting('last_score', self.score_to_submit)
+        self.score_to_submit = None
+        self.set_difficulty(self.difficulty)
+        
+    def draw_entry(self, text_color):
+        prompt = text_cache.render(self.text_font, f"New score: {self.score_to_submit}", True, text_color)
+        prompt_rect = prompt.get_rect(centerx=self.box_rect.centerx, y=self.box_rect.y + 140)
+        self.screen.blit(prompt, prompt_rect)
+        
+        self.name_box.draw(self.screen)
+        self.submit_button.draw(self.screen)
+        
+    def draw_rows(self, text_color):
+        row_height = 28
+        top = self.box_rect.y + 100
+        rank_x = self.box_rect.x + 60
+        name_x = self.box_rect.x + 140
+        score_right = self.box_rect.right - 60
+        first_rank = (len(self.page_starts) - 1) * self.page_size + 1
+        
+        if not self.rows:
+            empty = text_cache.render(self.text_font, "No scores yet, go win a match!", True, text_color)
+            empty_rect = empty.get_rect(centerx=self.box_rect.centerx, centery=self.box_rect.centery)
+            self.screen.blit(empty, empty_rect)
+            return
+            
+        for i, (score_id, name, score, created) in enumerate(self.rows):
+            y = top + i * row_height
+            color = (0, 160, 0) if score_id == self.highlight_id else text_color
+            rank_surface = text_cache.render(self.text_font, f"{first_rank + i}.", True, color)
+            name_surface = text_cache.render(self.text_font, name, True, color)
+            score_surface = text_cache.render(self.text_font, str(score), True, color)
+            self.screen.blit(rank_surface, (rank_x, y))
+            self.screen.blit(name_surface, (name_x, y))
+            self.screen.blit(score_surface, score_surface.get_rect(right=score_right, y=y))
         
+    def frame(self, events, frame_time=None):
+        self.width = self.screen.get_width()
+        self.height = self.screen.get_height()
         
-        box_width = 800
-        box_height = 300
-        box_x = (self.width - box_width) // 2
-        box_y = (self.height - box_height) // 2
         
-        self.box_rect = pygame.Rect(box_x, box_y, box_width, box_height)
+        gradient_cache.draw(self.screen, self.color_scheme["background"])
+        self.box_rect.center = (self.width // 2, self.height // 2)
+        layout = self.entry_layout if self.score_to_submit is not None else self.list_layout
+        layout.resize(self.width, self.height)
         
         
-        button_width = 150
-        button_height = 40
+        box_bg_color = (240, 240, 240) if self.color_scheme == COLOR_SCHEMES["HARD"] else (255, 255, 255)
+        pygame.draw.rect(self.screen, box_bg_color, self.box_rect, border_radius=15)
+        pygame.draw.rect(self.screen, self.color_scheme["button_border"], self.box_rect, border_radius=15, width=2)
         
-        self.back_button = Button(
-            box_x + (box_width - button_width) // 2,
-            box_y + box_height - button_height - 20,
-            button_width, button_height, "BACK", 28,
-            sound_file='assets/settings_menu_click.wav',
-            color_scheme=self.color_scheme
-        )
         
-        self.title_font = pygame.font.Font(None, 64)
-        self.text_font = pygame.font.Font(None, 32)
+        text_color = (0, 0, 0) if self.color_scheme == COLOR_SCHEMES["HARD"] else self.color_scheme["text"]
+        title = text_cache.render(self.title_font, "Leaderboard", True, text_color)
+        title_rect = title.get_rect(x=self.box_rect.x + 40, y=self.box_rect.y + 30)
+        self.screen.blit(title, title_rect)
         
-    def run(self):
-        while True:
-            self.width = self.screen.get_width()
-            self.height = self.screen.get_height()
-            
-            
-            bg_start, bg_end = self.color_scheme["background"]
-            self.screen.fill(bg_start)
-            gradient_steps = 12
-            step_height = self.height / gradient_steps
-            
-            for i in range(gradient_steps):
-                r = int(bg_start[0] + (bg_end[0] - bg_start[0]) * (i / gradient_steps))
-                g = int(bg_start[1] + (bg_end[1] - bg_start[1]) * (i / gradient_steps))
-                b = int(bg_start[2] + (bg_end[2] - bg_start[2]) * (i / gradient_steps))
-                color = (r, g, b)
-                pygame.draw.rect(self.screen, color,
-                               (0, i * step_height, self.width, step_height + 1))
-            
-            
-            box_bg_color = (240, 240, 240) if self.color_scheme == COLOR_SCHEMES["HARD"] else (255, 255, 255)
-            pygame.draw.rect(self.screen, box_bg_color, self.box_rect, border_radius=15)
-            pygame.draw.rect(self.screen, self.color_scheme["button_border"], self.box_rect, border_radius=15, width=2)
-            
-            
-            text_color = (0, 0, 0) if self.color_scheme == COLOR_SCHEMES["HARD"] else self.color_scheme["text"]
-            title = self.title_font.render("Global Leaderboard", True, text_color)
-            title_rect = title.get_rect(centerx=self.width // 2, y=self.box_rect.y + 40)
-            self.screen.blit(title, title_rect)
-            
-            
-            coming_soon = self.text_font.render("Feature coming soon...", True, text_color)
-            coming_soon_rect = coming_soon.get_rect(centerx=self.width // 2, centery=self.box_rect.centery)
-            self.screen.blit(coming_soon, coming_soon_rect)
-            
-            
-            self.back_button.draw(self.screen)
-            
-            
-            mouse_pos = pygame.mouse.get_pos()
-            self.cursor.draw(self.screen, mouse_pos)
-            
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "quit"
-                    
-                if self.back_button.handle_event(event):
-                    return "back"
-                    
-            pygame.display.flip() 
\ No newline at end of file
+        
+        if self.score_to_submit is not None:
+            self.draw_entry(text_color)
+        else:
+            self.draw_rows(text_color)
+            self.difficulty_button.draw(self.screen)
+            if len(self.page_starts) > 1:
+                self.prev_button.draw(self.screen)
+            if self.has_next_page:
+                self.next_button.draw(self.screen)
+        
+        
+        self.back_button.draw(self.screen)
+        
+        
+        mouse_pos = pygame.mouse.get_pos()
+        self.cursor.draw(self.screen, mouse_pos)
+        
+        
+        for event in events:
+            if event.type == pygame.QUIT:
+                return "quit"
+                
+            if self.score_to_submit is not None:
+                clicked = self.entry_layout.handle_event(event)
+                if clicked is self.submit_button or \
+                   (event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN):
+                    self.submit_score()
+            else:
+                clicked = self.list_layout.handle_event(event)
+                if clicked is self.difficulty_button:
+                    difficulties = ["easy", "medium", "hard"]
+                    index = difficulties.index(self.difficulty) if self.difficulty in difficulties else -1
+                    self.set_difficulty(difficulties[(index + 1) % len(difficulties)])
+                if clicked is self.prev_button and len(self.page_starts) > 1:
+                    self.previous_page()
+                if clicked is self.next_button and self.has_next_page:
+                    self.next_page()
+                
+            if clicked is self.back_button:
+                return "back"
+        return None
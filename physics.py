@@ -0,0 +1,306 @@
+from array import array
+
+
+INFINITY = float("inf")
+
+
+def sweep_box(x, y, size, dx, dy, rect):
+    """Sweeps a size x size box at (x, y) along (dx, dy) against rect.
+
+    Returns (time, axis) with time in [0, 1] for the first contact during
+    the move, (0.0, axis) when the box already overlaps rect and is moving
+    further into it, or None when there is no hit.
+    """
+    left = rect.left - size
+    right = rect.right
+    top = rect.top - size
+    bottom = rect.bottom
+
+    if dx == 0:
+        if not left < x < right:
+            return None
+        x_entry, x_exit = -INFINITY, INFINITY
+    else:
+        t1 = (left - x) / dx
+        t2 = (right - x) / dx
+        x_entry, x_exit = min(t1, t2), max(t1, t2)
+
+    if dy == 0:
+        if not top < y < bottom:
+            return None
+        y_entry, y_exit = -INFINITY, INFINITY
+    else:
+        t1 = (top - y) / dy
+        t2 = (bottom - y) / dy
+        y_entry, y_exit = min(t1, t2), max(t1, t2)
+
+    entry = max(x_entry, y_entry)
+    exit = min(x_exit, y_exit)
+    if entry >= exit or exit <= 0 or entry > 1:
+        return None
+
+    if entry < 0:
+        # Already overlapping, e.g. a paddle moved into the ball. Only
+        # resolve it when the ball is still heading into the paddle.
+        center = x + size / 2
+        if dx == 0 or (dx > 0) != (center < rect.centerx):
+            return None
+        return 0.0, "x"
+
+    return entry, ("x" if x_entry >= y_entry else "y")
+
+
+def move_ball(ball, paddle_left, paddle_right, height, dt, max_bounces=4):
+    """Advances ball by dt seconds, resolving every wall and paddle contact
+    at its exact time of impact. Returns the paddles hit on their face."""
+    hits = []
+    remaining = dt
+    size = ball.size
+
+    for _ in range(max_bounces + 1):
+        dx = ball.speed_x * remaining
+        dy = ball.speed_y * remaining
+        x = ball.position_x
+        y = ball.position_y
+
+        first_time = 1.0
+        first_hit = None
+        first_axis = None
+
+        if dy < 0:
+            t = max(0.0, -y / dy)
+            if t < first_time:
+                first_time, first_hit = t, "top"
+        elif dy > 0:
+            t = max(0.0, (height - size - y) / dy)
+            if t < first_time:
+                first_time, first_hit = t, "bottom"
+
+        for paddle in (paddle_left, paddle_right):
+            if not paddle.alive:
+                continue
+            rect = paddle.rect
+            if x + size + max(dx, 0) < rect.left or x + min(dx, 0) > rect.right:
+                continue
+            contact = sweep_box(x, y, size, dx, dy, rect)
+            if contact is not None and contact[0] <= first_time:
+                first_time, first_hit = contact[0], paddle
+                first_axis = contact[1]
+
+        ball.position_x = x + dx * first_time
+        ball.position_y = y + dy * first_time
+
+        if first_hit is None:
+            break
+        if first_hit == "top":
+            ball.speed_y = abs(ball.speed_y)
+        elif first_hit == "bottom":
+            ball.speed_y = -abs(ball.speed_y)
+        elif first_axis == "y":
+            ball.speed_y = -ball.speed_y
+        else:
+            ball.bounce_paddle(is_left_paddle=first_hit is paddle_left)
+            hits.append(first_hit)
+
+        remaining *= 1.0 - first_time
+        if remaining <= 1e-9 * dt:
+            break
+
+    ball.rect.x = round(ball.position_x)
+    ball.rect.y = round(ball.position_y)
+    return hits
+
+
+def predict_y(x, y, speed_x, speed_y, size, target_x, height):
+    """Returns the ball's y once its left edge reaches target_x, or None
+    when it is moving away. Wall bounces are folded in closed form: the
+    path is unrolled into a straight line and reflected back into
+    [0, height - size]."""
+    if speed_x == 0:
+        return None
+    time = (target_x - x) / speed_x
+    if time < 0:
+        return None
+
+    span = height - size
+    if span <= 0:
+        return 0.0
+    unrolled = (y + speed_y * time) % (2 * span)
+    if unrolled > span:
+        unrolled = 2 * span - unrolled
+    return unrolled
+
+
+class SpatialHash:
+    """Uniform grid of rect-shaped items for overlap queries.
+
+    Items are inserted with the rect they cover and indexed in every cell
+    it touches, so a query only looks at items near the queried rect.
+    Call move() or remove() when an item's rect changes or it goes away.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.items = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, item, rect):
+        if item in self.items:
+            self.remove(item)
+        cells = self.cell_range(rect)
+        self.items[item] = (rect.copy(), cells)
+        left, top, right, bottom = cells
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                self.cells.setdefault((cx, cy), []).append(item)
+
+    def remove(self, item):
+        entry = self.items.pop(item, None)
+        if entry is None:
+            return
+        left, top, right, bottom = entry[1]
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = self.cells[(cx, cy)]
+                bucket.remove(item)
+                if not bucket:
+                    del self.cells[(cx, cy)]
+
+    def move(self, item, rect):
+        self.insert(item, rect)
+
+    def clear(self):
+        self.cells.clear()
+        self.items.clear()
+
+    def query(self, rect):
+        """Items whose rect overlaps rect, in insertion order per cell."""
+        left, top, right, bottom = self.cell_range(rect)
+        if left == right and top == bottom:
+            bucket = self.cells.get((left, top))
+            if not bucket:
+                return []
+            return [item for item in bucket if self.items[item][0].colliderect(rect)]
+
+        found = []
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                for item in self.cells.get((cx, cy), ()):
+                    if item not in found and self.items[item][0].colliderect(rect):
+                        found.append(item)
+        return found
+
+    def query_point(self, pos):
+        bucket = self.cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size))
+        if not bucket:
+            return []
+        return [item for item in bucket if self.items[item][0].collidepoint(pos)]
+
+
+class BallSet:
+    """Every ball in play, stored as parallel arrays.
+
+    Positions, velocities and sizes live in one array per field, indexed by
+    each Ball's slot, so a tick is a single pass over flat arrays. Balls
+    that cannot touch a wall or paddle this tick just advance; only the
+    rest go through the swept collision in move_ball().
+    """
+
+    def __init__(self):
+        self.x = array('d')
+        self.y = array('d')
+        self.speed_x = array('d')
+        self.speed_y = array('d')
+        self.previous_x = array('d')
+        self.previous_y = array('d')
+        self.size = array('d')
+        self.balls = []
+
+    def __len__(self):
+        return len(self.balls)
+
+    def __iter__(self):
+        return iter(self.balls)
+
+    def __contains__(self, ball):
+        return ball.ball_set is self
+
+    def add(self, ball, x, y, size):
+        ball.ball_set = self
+        ball.slot = len(self.balls)
+        self.balls.append(ball)
+        for field, value in ((self.x, x), (self.y, y), (self.speed_x, 0.0), (self.speed_y, 0.0),
+                             (self.previous_x, x), (self.previous_y, y), (self.size, size)):
+            field.append(value)
+
+    def remove(self, ball):
+        if ball.ball_set is not self:
+            return
+        slot = ball.slot
+        state = [field[slot] for field in (self.x, self.y, self.speed_x, self.speed_y)]
+        last = len(self.balls) - 1
+        for field in (self.x, self.y, self.speed_x, self.speed_y,
+                      self.previous_x, self.previous_y, self.size):
+            field[slot] = field[last]
+            field.pop()
+        moved = self.balls.pop()
+        if moved is not ball:
+            self.balls[slot] = moved
+            moved.slot = slot
+
+        # A removed ball keeps working on its own, in a set of one.
+        BallSet().add(ball, state[0], state[1], ball.size)
+        ball.speed_x, ball.speed_y = state[2], state[3]
+
+    def store_previous(self):
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+
+    def move(self, paddle_left, paddle_right, height, dt):
+        """Advances every ball by dt seconds. Returns (ball, paddle) for
+        each paddle face hit."""
+        hits = []
+        xs, ys = self.x, self.y
+        speeds_x, speeds_y = self.speed_x, self.speed_y
+        sizes = self.size
+
+        # x ranges a ball must stay clear of to skip the swept test.
+        bands = [(paddle.rect.left, paddle.rect.right)
+                 for paddle in (paddle_left, paddle_right) if paddle.alive]
+
+        for slot in range(len(self.balls)):
+            x = xs[slot]
+            y = ys[slot]
+            dx = speeds_x[slot] * dt
+            dy = speeds_y[slot] * dt
+            size = sizes[slot]
+            new_x = x + dx
+            new_y = y + dy
+
+            free = 0 <= new_y <= height - size
+            if free:
+                low = min(x, new_x)
+                high = max(x, new_x) + size
+                for left, right in bands:
+                    if not (high < left or low > right):
+                        free = False
+                        break
+
+            ball = self.balls[slot]
+            if free:
+                xs[slot] = new_x
+                ys[slot] = new_y
+                ball.rect.x = round(new_x)
+                ball.rect.y = round(new_y)
+            else:
+                for paddle in move_ball(ball, paddle_left, paddle_right, height, dt):
+                    hits.append((ball, paddle))
+        return hits
@@ -0,0 +1,152 @@
+import atexit
+import csv
+import json
+import os
+import time
+from collections import deque
+
+
+PROFILE_ENV = "PING_BANG_PROFILE"
+PROFILE_FILE = "profile.json"
+
+PERCENTILES = (50, 95, 99)
+
+
+class Profiler:
+    """Named timing spans summed per frame, with rolling percentiles.
+
+    Wrap a section as
+
+        start = profiler.begin()
+        ...
+        profiler.end("physics", start)
+
+    and call frame_done() once per presented frame. While disabled,
+    begin() returns None and end() returns straight away, so the hooks
+    can stay in the game loop.
+    """
+
+    def __init__(self, window=300):
+        self.window = window
+        self.enabled = False
+        self.overlay_visible = False
+        self.current = {}
+        self.samples = {}
+        self.frames = 0
+        self.frame_start = None
+        self.overlay_lines = []
+        self.overlay_updated = 0.0
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+        self.frame_start = None
+        self.current.clear()
+
+    def toggle_overlay(self):
+        """Shows or hides the F3 overlay. Timing runs while it is shown,
+        and all the time when PING_BANG_PROFILE is set."""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible and not self.enabled:
+            self.enable()
+        elif not self.overlay_visible and not os.environ.get(PROFILE_ENV):
+            self.enable(False)
+
+    def begin(self):
+        if not self.enabled:
+            return None
+        return time.perf_counter()
+
+    def end(self, name, start):
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        self.current[name] = self.current.get(name, 0.0) + elapsed
+
+    def frame_done(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.current["frame"] = now - self.frame_start
+        self.frame_start = now
+
+        for name, elapsed in self.current.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(elapsed)
+        self.current = {}
+        self.frames += 1
+
+    def stats(self):
+        """Returns {span: {"p50": ms, "p95": ms, "p99": ms, "max": ms}}."""
+        stats = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            if not ordered:
+                continue
+            entry = {}
+            for percentile in PERCENTILES:
+                index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+                entry[f"p{percentile}"] = ordered[index] * 1000
+            entry["max"] = ordered[-1] * 1000
+            stats[name] = entry
+        return stats
+
+    def draw_overlay(self, screen, font, refresh=0.5):
+        if not self.overlay_visible:
+            return None
+        from cache import text_cache
+
+        # Percentiles are recomputed a couple of times a second, not every
+        # frame, so the overlay itself stays out of the numbers it shows.
+        now = time.perf_counter()
+        if now - self.overlay_updated >= refresh or not self.overlay_lines:
+            self.overlay_updated = now
+            self.overlay_lines = ["span          p50    p95    p99  (ms)"]
+            for name, entry in sorted(self.stats().items()):
+                self.overlay_lines.append(
+                    f"{name:<10} {entry['p50']:6.2f} {entry['p95']:6.2f} {entry['p99']:6.2f}")
+
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in self.overlay_lines) + 16
+        area = screen.fill((0, 0, 0), (8, 8, width, line_height * len(self.overlay_lines) + 12))
+        for i, line in enumerate(self.overlay_lines):
+            text = text_cache.render(font, line, True, (0, 255, 0))
+            screen.blit(text, (16, 14 + i * line_height))
+        return area
+
+    def dump(self, path=PROFILE_FILE):
+        if not self.frames:
+            return
+        stats = self.stats()
+        try:
+            if path.endswith(".csv"):
+                with open(path, 'w', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["span"] + [f"p{p}_ms" for p in PERCENTILES] + ["max_ms"])
+                    for name, entry in sorted(stats.items()):
+                        writer.writerow([name] + [f"{entry[f'p{p}']:.4f}" for p in PERCENTILES]
+                                        + [f"{entry['max']:.4f}"])
+            else:
+                with open(path, 'w') as f:
+                    json.dump({"frames": self.frames, "window": self.window, "spans": stats}, f, indent=4)
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+
+
+profiler = Profiler()
+
+
+def dump_on_exit():
+    path = os.environ.get(PROFILE_ENV)
+    if not path or path == "1":
+        path = PROFILE_FILE
+    profiler.dump(path)
+
+
+# Only an explicit PING_BANG_PROFILE run writes a profile on exit; the
+# F3 overlay on its own never leaves files behind.
+if os.environ.get(PROFILE_ENV):
+    profiler.enable()
+    atexit.register(dump_on_exit)
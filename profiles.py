@@ -0,0 +1,84 @@
+import json
+from collections import namedtuple
+
+
+PROFILES_FILE = "ai_profiles.json"
+DEFAULT_PROFILE = "hard"
+
+
+# Speeds are in pixels per second. reaction_speed, smoothing and
+# prediction_smoothing are rates per second: the higher, the quicker the
+# paddle's velocity and aim settle on their targets. The built-in values
+# are the original per-frame numbers at 500 frames per second, about what
+# the original uncapped game loop managed.
+AIProfile = namedtuple("AIProfile", [
+    "name",
+    "reaction_speed",
+    "prediction_noise",
+    "max_speed",
+    "smoothing",
+    "prediction_smoothing",
+    "acceleration_factor",
+    "predict_trajectory",
+    "ball_speed",
+    "max_ball_speed",
+])
+
+
+BUILTIN_PROFILES = {
+    "easy": AIProfile("easy", 4, 23, 1250, 8, 15, 0.3, False, 50, 1250),
+    "medium": AIProfile("medium", 12.5, 13, 1750, 26, 42, 0.5, False, 250, 2500),
+    "hard": AIProfile("hard", 20, 25, 2250, 42, 64, 0.7, True, 750, None),
+}
+
+
+def load_profiles(path=PROFILES_FILE):
+    """Reads AI difficulty profiles from a JSON object of name -> fields.
+
+    Profiles start from the built-in "hard" values, so a custom profile
+    only needs to list the fields it changes.
+    """
+    profiles = dict(BUILTIN_PROFILES)
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return profiles
+    except (OSError, ValueError) as e:
+        print(f"Error loading AI profiles: {e}")
+        return profiles
+    if not isinstance(data, dict):
+        print(f"Error loading AI profiles: {path} should hold an object of profiles")
+        return profiles
+
+    for name, fields in data.items():
+        name = name.lower()
+        if not isinstance(fields, dict):
+            print(f"AI profile '{name}' should be an object of fields, skipping it")
+            continue
+        base = profiles.get(name, BUILTIN_PROFILES[DEFAULT_PROFILE])
+        known = {key: value for key, value in fields.items() if key in AIProfile._fields and key != "name"}
+        for key in fields:
+            if key not in known:
+                print(f"Unknown AI profile field '{key}' in profile '{name}'")
+        profiles[name] = base._replace(name=name, **known)
+    return profiles
+
+
+loaded_profiles = None
+
+
+def get_profiles():
+    global loaded_profiles
+    if loaded_profiles is None:
+        loaded_profiles = load_profiles()
+    return loaded_profiles
+
+
+def get_profile(name):
+    profiles = get_profiles()
+    profile = profiles.get(str(name).lower())
+    if profile is None:
+        print(f"Unknown AI difficulty '{name}', using {DEFAULT_PROFILE}")
+        profile = profiles[DEFAULT_PROFILE]
+    return profile
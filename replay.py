@@ -0,0 +1,146 @@
+import argparse
+import os
+import struct
+import time
+
+
+REPLAY_DIR = "replays"
+LAST_MATCH_FILE = os.path.join(REPLAY_DIR, "last_match.pbr")
+
+MAGIC = b"PBRP"
+VERSION = 1
+
+# magic, version, seed, tick rate, width, height, ball count, max modifiers,
+# ticks, total score, winner, difficulty length; the difficulty name follows.
+HEADER = struct.Struct("<4sBIHHHHHIIBB")
+# Run-length encoded input: repeat count, mouse y, key flags.
+RUN = struct.Struct("<HhB")
+MAX_RUN = 0xFFFF
+
+KEY_UP = 1
+KEY_DOWN = 2
+
+WINNERS = (None, "Player", "AI")
+
+
+class Replay:
+    """The seed, settings and per-tick player input of one match.
+
+    Inputs are stored run-length encoded, since the mouse and keys hold
+    still for most ticks. Playing the inputs back into a Game built with
+    the same seed reproduces the match exactly.
+    """
+
+    def __init__(self, seed, difficulty, size, tick_rate, ball_count=1, max_modifiers=2):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.size = tuple(size)
+        self.tick_rate = tick_rate
+        self.ball_count = ball_count
+        self.max_modifiers = max_modifiers
+        self.runs = []
+        self.ticks = 0
+        self.total_score = 0
+        self.winner = None
+
+    def record(self, mouse_y, move_up, move_down):
+        mouse_y = max(-0x8000, min(0x7FFF, mouse_y))
+        flags = (KEY_UP if move_up else 0) | (KEY_DOWN if move_down else 0)
+        self.ticks += 1
+        if self.runs:
+            last = self.runs[-1]
+            if last[1] == mouse_y and last[2] == flags and last[0] < MAX_RUN:
+                last[0] += 1
+                return
+        self.runs.append([1, mouse_y, flags])
+
+    def finish(self, game):
+        self.total_score = game.total_score
+        self.winner = game.winner
+
+    def inputs(self):
+        for count, mouse_y, flags in self.runs:
+            move_up = bool(flags & KEY_UP)
+            move_down = bool(flags & KEY_DOWN)
+            for _ in range(count):
+                yield mouse_y, move_up, move_down
+
+    def to_bytes(self):
+        difficulty = self.difficulty.encode("utf-8")
+        parts = [HEADER.pack(MAGIC, VERSION, self.seed, self.tick_rate,
+                             self.size[0], self.size[1], self.ball_count, self.max_modifiers,
+                             self.ticks, self.total_score, WINNERS.index(self.winner),
+                             len(difficulty)), difficulty]
+        parts.extend(RUN.pack(*run) for run in self.runs)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        (magic, version, seed, tick_rate, width, height, ball_count, max_modifiers,
+         ticks, total_score, winner, name_length) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a ping bang replay")
+        offset = HEADER.size
+        difficulty = data[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+
+        replay = cls(seed, difficulty, (width, height), tick_rate, ball_count, max_modifiers)
+        replay.runs = [list(run) for run in RUN.iter_unpack(data[offset:])]
+        replay.ticks = ticks
+        replay.total_score = total_score
+        replay.winner = WINNERS[winner]
+        return replay
+
+    def save(self, path=LAST_MATCH_FILE):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(self.to_bytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path=LAST_MATCH_FILE):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def play(replay):
+    """Runs replay headless as fast as possible, at the tick rate it was
+    recorded at, and returns the Game."""
+    from game import Game
+
+    game = Game(None, replay.difficulty, headless=True, size=replay.size, seed=replay.seed,
+                ball_count=replay.ball_count, max_modifiers=replay.max_modifiers, record=False,
+                tick_rate=replay.tick_rate)
+    for mouse_y, move_up, move_down in replay.inputs():
+        game.step(mouse_y, move_up, move_down)
+        if game.game_over:
+            break
+    return game
+
+
+def main():
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    parser = argparse.ArgumentParser(description="Replay a recorded ping bang match headless")
+    parser.add_argument("path", nargs="?", default=LAST_MATCH_FILE)
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    start = time.perf_counter()
+    game = play(replay)
+    elapsed = time.perf_counter() - start
+
+    matches = (game.sim_ticks, game.winner, game.total_score) == (
+        replay.ticks, replay.winner, replay.total_score)
+    print(f"seed:       {replay.seed} ({replay.difficulty}, {replay.size[0]}x{replay.size[1]})")
+    print(f"recorded:   {replay.ticks} ticks, winner {replay.winner}, score {replay.total_score}")
+    print(f"replayed:   {game.sim_ticks} ticks, winner {game.winner}, score {game.total_score}")
+    print(f"wall time:  {elapsed:.2f}s ({replay.ticks / replay.tick_rate / max(elapsed, 1e-9):.0f}x real time)")
+    print("result:     " + ("identical" if matches else "DIVERGED"))
+    return 0 if matches else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
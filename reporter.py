@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import uuid
+
+
+OUTBOX_DIR = "outbox"
+FAILED_DIR = "failed"
+
+QUEUED = "queued"
+SENDING = "sending"
+RETRYING = "retrying"
+SENT = "sent"
+SAVED = "saved"
+FAILED = "failed"
+
+
+def http_post(url, message, timeout):
+    """Posts message as JSON and returns (status code, headers).
+
+    Raises ValueError for an unusable URL and OSError for network errors;
+    requests' own exceptions already derive from those.
+    """
+    import requests
+    
+    response = requests.post(url, json=message, timeout=timeout)
+    return response.status_code, response.headers
+
+
+class BugReporter:
+    """Sends bug reports from a background thread.
+
+    Every report is written to the outbox directory before it is queued and
+    removed once the webhook accepts it, so reports that could not be
+    delivered are picked up again by start() on the next launch. Reports
+    the webhook turns down for good are moved to outbox/failed along with
+    the reason, instead of being thrown away.
+
+    transport is called as transport(url, message, timeout) in place of
+    http_post(), e.g. to point the reporter at a stub in tests.
+    """
+
+    def __init__(self, url, outbox_dir=OUTBOX_DIR, timeout=5.0, max_attempts=5,
+                 backoff=1.0, max_backoff=30.0, queue_size=16, transport=http_post):
+        self.url = url
+        self.transport = transport
+        self.outbox_dir = outbox_dir
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.statuses = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.worker = None
+
+    def start(self):
+        if self.worker is not None:
+            return
+        self.stop_event.clear()
+        self.worker = threading.Thread(target=self.run, daemon=True)
+        self.worker.start()
+        for report_id in self.pending_reports():
+            self.enqueue(report_id)
+
+    def stop(self, timeout=None):
+        self.stop_event.set()
+        if self.worker is not None:
+            self.worker.join(timeout)
+            self.worker = None
+
+    def submit(self, message):
+        report_id = uuid.uuid4().hex
+        self.write_report(report_id, message)
+        self.enqueue(report_id)
+        return report_id
+
+    def status(self, report_id):
+        with self.lock:
+            return self.statuses.get(report_id, (QUEUED, ""))
+
+    def set_status(self, report_id, state, detail=""):
+        with self.lock:
+            self.statuses[report_id] = (state, detail)
+
+    def enqueue(self, report_id):
+        self.set_status(report_id, QUEUED)
+        try:
+            self.queue.put_nowait(report_id)
+        except queue.Full:
+            self.set_status(report_id, SAVED, "queue full")
+
+    def report_path(self, report_id):
+        return os.path.join(self.outbox_dir, f"{report_id}.json")
+
+    def pending_reports(self):
+        if not os.path.isdir(self.outbox_dir):
+            return []
+        names = [name for name in os.listdir(self.outbox_dir) if name.endswith(".json")]
+        names.sort(key=lambda name: os.path.getmtime(os.path.join(self.outbox_dir, name)))
+        return [name[:-len(".json")] for name in names]
+
+    def write_report(self, report_id, message):
+        os.makedirs(self.outbox_dir, exist_ok=True)
+        path = self.report_path(report_id)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(message, f)
+        os.replace(temp_path, path)
+
+    def failed_path(self, report_id):
+        return os.path.join(self.outbox_dir, FAILED_DIR, f"{report_id}.json")
+
+    def fail_report(self, report_id, message, reason):
+        """Moves a report that can never be delivered out of the outbox,
+        keeping it and the reason. It stays in the outbox if that fails."""
+        path = self.failed_path(report_id)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({"reason": reason, "message": message}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error keeping failed bug report: {e}")
+            return
+        self.remove_report(report_id)
+
+    def read_report(self, report_id):
+        try:
+            with open(self.report_path(report_id), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def remove_report(self, report_id):
+        try:
+            os.remove(self.report_path(report_id))
+        except OSError:
+            pass
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                report_id = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self.deliver(report_id)
+
+    def deliver(self, report_id):
+        message = self.read_report(report_id)
+        if message is None:
+            self.set_status(report_id, FAILED, "report file missing")
+            return
+
+        delay = self.backoff
+        for attempt in range(1, self.max_attempts + 1):
+            self.set_status(report_id, SENDING, f"attempt {attempt}/{self.max_attempts}")
+            retry, detail, retry_after = self.post(message)
+            if not retry:
+                if detail is None:
+                    self.remove_report(report_id)
+                    self.set_status(report_id, SENT)
+                else:
+                    self.fail_report(report_id, message, detail)
+                    self.set_status(report_id, FAILED, detail)
+                return
+            if attempt == self.max_attempts:
+                break
+
+            wait = min(self.max_backoff, retry_after if retry_after is not None else delay)
+            self.set_status(report_id, RETRYING, f"{detail}, retrying in {wait:.0f}s")
+            if self.stop_event.wait(wait):
+                break
+            delay = min(self.max_backoff, delay * 2)
+
+        self.set_status(report_id, SAVED, detail)
+
+    def post(self, message):
+        """Returns (retry, error detail or None on success, retry-after seconds)."""
+        try:
+            status_code, headers = self.transport(self.url, message, self.timeout)
+        except ValueError as e:
+            print(f"Error sending bug report: {e}")
+            return False, "invalid webhook URL", None
+        except OSError as e:
+            print(f"Error sending bug report: {e}")
+            return True, "network error", None
+
+        if 200 <= status_code < 300:
+            return False, None, None
+        if status_code == 429 or status_code >= 500:
+            retry_after = None
+            try:
+                retry_after = float(headers.get("Retry-After", ""))
+            except ValueError:
+                pass
+            return True, f"HTTP {status_code}", retry_after
+        return False, f"HTTP {status_code}", None
+
+
+def check():
+    """Delivers reports through stub transports and checks that none is
+    lost: a bad URL keeps the report in outbox/failed, and a 500 is
+    retried until it goes through."""
+    outbox = tempfile.mkdtemp(prefix="ping-bang-outbox-")
+    try:
+        def bad_url(url, message, timeout):
+            raise ValueError(f"Invalid URL {url!r}")
+
+        reporter = BugReporter("nuh uh", outbox_dir=outbox, transport=bad_url)
+        report_id = uuid.uuid4().hex
+        reporter.write_report(report_id, {"content": "bad url"})
+        reporter.deliver(report_id)
+        with open(reporter.failed_path(report_id), 'r') as f:
+            kept = json.load(f)
+        bad_url_ok = (reporter.status(report_id) == (FAILED, "invalid webhook URL")
+                      and kept == {"reason": "invalid webhook URL", "message": {"content": "bad url"}}
+                      and not os.path.exists(reporter.report_path(report_id)))
+
+        replies = [(500, {"Retry-After": "0"}), (200, {})]
+        sent = []
+
+        def flaky(url, message, timeout):
+            sent.append(message)
+            return replies.pop(0)
+
+        reporter = BugReporter("http://stub", outbox_dir=outbox, transport=flaky, backoff=0)
+        report_id = uuid.uuid4().hex
+        reporter.write_report(report_id, {"content": "retry"})
+        reporter.deliver(report_id)
+        retry_ok = (reporter.status(report_id) == (SENT, "") and len(sent) == 2
+                    and not os.path.exists(reporter.report_path(report_id)))
+    finally:
+        shutil.rmtree(outbox, ignore_errors=True)
+
+    print("invalid URL:  " + ("kept in outbox/failed" if bad_url_ok else "LOST"))
+    print("500 then 200: " + ("sent on retry" if retry_ok else "NOT SENT"))
+    return 0 if bad_url_ok and retry_ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check bug report delivery against stub transports")
+    parser.parse_args()
+    return check()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
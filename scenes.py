@@ -0,0 +1,87 @@
+class Scene:
+    """Something the SceneManager can show: the menu, a submenu or the game.
+
+    frame() draws one frame and returns a result string when the scene
+    wants to leave, or None to keep going. enter() runs each time the
+    scene comes to the top of the stack and exit() each time it leaves,
+    so per-visit state is reset there instead of in __init__.
+    """
+
+    def enter(self, **kwargs):
+        pass
+
+    def exit(self):
+        pass
+
+    def resize(self, width, height):
+        pass
+
+    def frame(self, events, frame_time):
+        return None
+
+
+class SceneManager:
+    """A stack of scenes, each built once by its factory and then kept.
+
+    Scenes are registered by name with register() (built on first use)
+    or add() (already built). Showing a scene again reuses the same
+    instance, so its fonts, buttons and sounds are only loaded once.
+    """
+
+    def __init__(self):
+        self.factories = {}
+        self.scenes = {}
+        self.stack = []
+
+    def register(self, name, factory):
+        self.factories[name] = factory
+
+    def add(self, name, scene):
+        self.scenes[name] = scene
+
+    def get(self, name):
+        scene = self.scenes.get(name)
+        if scene is None:
+            scene = self.scenes[name] = self.factories[name]()
+        return scene
+
+    @property
+    def current_name(self):
+        return self.stack[-1] if self.stack else None
+
+    @property
+    def current(self):
+        return self.scenes[self.stack[-1]] if self.stack else None
+
+    def push(self, name, **kwargs):
+        scene = self.get(name)
+        self.stack.append(name)
+        scene.enter(**kwargs)
+        return scene
+
+    def pop(self):
+        """Leaves the top scene and returns to the one under it, which is
+        entered again without arguments."""
+        name = self.stack.pop()
+        self.scenes[name].exit()
+        if self.stack:
+            self.current.enter()
+        return name
+
+    def replace(self, name, **kwargs):
+        if self.stack:
+            self.scenes[self.stack.pop()].exit()
+        return self.push(name, **kwargs)
+
+    def frame(self, events, frame_time):
+        return self.current.frame(events, frame_time)
+
+    def resize(self, width, height):
+        """Lays the scenes out for a new screen size. Scenes built by a
+        factory that are not showing are dropped and built again at the
+        new size when next opened; the others resize in place."""
+        for name, scene in list(self.scenes.items()):
+            if name in self.factories and name not in self.stack:
+                del self.scenes[name]
+            else:
+                scene.resize(width, height)
@@ -0,0 +1,71 @@
+import heapq
+import itertools
+
+
+class Timer:
+    def __init__(self, due, callback, args):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class Scheduler:
+    """Runs callbacks at a future time on a min-heap keyed by due time.
+
+    Time only moves when advance() is called, so the game drives it from
+    its fixed timestep, and every timer is paused while the game is not
+    stepping (behind a menu, during a transition or after game over).
+    Cancelled and rescheduled timers are left in the heap and skipped
+    when they come up, which keeps every operation at O(log n) and an
+    advance() with nothing due at O(1).
+    """
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.heap = []
+        self.order = itertools.count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def schedule(self, delay, callback, *args):
+        timer = Timer(self.now + delay, callback, args)
+        self.push(timer)
+        return timer
+
+    def push(self, timer):
+        heapq.heappush(self.heap, (timer.due, next(self.order), timer))
+
+    def cancel(self, timer):
+        if timer is not None:
+            timer.cancelled = True
+
+    def reschedule(self, timer, delay):
+        """Moves a pending timer to delay from now."""
+        timer.due = self.now + delay
+        self.push(timer)
+
+    def extend(self, timer, delay):
+        self.reschedule(timer, self.remaining(timer) + delay)
+
+    def remaining(self, timer):
+        if timer is None or timer.cancelled:
+            return 0.0
+        return max(0.0, timer.due - self.now)
+
+    def advance(self, now):
+        self.now = now
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            due, _, timer = heapq.heappop(heap)
+            # Skip stale heap entries left behind by cancel or reschedule.
+            if timer.cancelled or due != timer.due:
+                continue
+            timer.cancelled = True
+            timer.callback(*timer.args)
+
+    def clear(self):
+        for _, _, timer in self.heap:
+            timer.cancelled = True
+        self.heap.clear()
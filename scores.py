@@ -0,0 +1,95 @@
+import sqlite3
+import time
+
+
+SCORES_FILE = "scores.db"
+
+
+class ScoreStore:
+    """Append-only local high-score table.
+
+    Scores live in a SQLite file with an index on (difficulty, score), so
+    top-N queries and page lookups are index seeks and never load the
+    whole table. Pages are addressed by the (score, id) of the last row
+    shown rather than by offset.
+    """
+
+    def __init__(self, path=SCORES_FILE):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "id INTEGER PRIMARY KEY, "
+            "name TEXT NOT NULL, "
+            "score INTEGER NOT NULL, "
+            "difficulty TEXT NOT NULL, "
+            "created REAL NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS scores_by_difficulty "
+            "ON scores (difficulty, score DESC, id)"
+        )
+        self.connection.commit()
+
+    def add(self, name, score, difficulty):
+        cursor = self.connection.execute(
+            "INSERT INTO scores (name, score, difficulty, created) VALUES (?, ?, ?, ?)",
+            (name, int(score), difficulty, time.time())
+        )
+        self.connection.commit()
+        return cursor.lastrowid
+
+    def add_many(self, entries):
+        now = time.time()
+        self.connection.executemany(
+            "INSERT INTO scores (name, score, difficulty, created) VALUES (?, ?, ?, ?)",
+            ((name, int(score), difficulty, now) for name, score, difficulty in entries)
+        )
+        self.connection.commit()
+
+    def top(self, difficulty, limit=10, after=None):
+        """Returns up to limit (id, name, score, created) rows, best first.
+
+        Pass the (score, id) of the last row of a page as after to get the
+        next page.
+        """
+        if after is None:
+            rows = self.connection.execute(
+                "SELECT id, name, score, created FROM scores "
+                "WHERE difficulty = ? ORDER BY score DESC, id LIMIT ?",
+                (difficulty, limit)
+            )
+            return rows.fetchall()
+
+        # Two index range seeks: the rest of the tied score, then lower scores.
+        last_score, last_id = after
+        rows = self.connection.execute(
+            "SELECT id, name, score, created FROM scores "
+            "WHERE difficulty = ? AND score = ? AND id > ? ORDER BY id LIMIT ?",
+            (difficulty, last_score, last_id, limit)
+        ).fetchall()
+        if len(rows) < limit:
+            rows += self.connection.execute(
+                "SELECT id, name, score, created FROM scores "
+                "WHERE difficulty = ? AND score < ? ORDER BY score DESC, id LIMIT ?",
+                (difficulty, last_score, limit - len(rows))
+            ).fetchall()
+        return rows
+
+    def best(self, difficulty):
+        rows = self.top(difficulty, 1)
+        return rows[0][2] if rows else None
+
+    def close(self):
+        self.connection.close()
+
+
+shared_store = None
+
+
+def get_score_store():
+    global shared_store
+    if shared_store is None:
+        shared_store = ScoreStore()
+    return shared_store
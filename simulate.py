@@ -0,0 +1,79 @@
+import argparse
+import multiprocessing
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from game import Game, HEADLESS_TICK_RATE
+from profiles import get_profiles
+
+
+def run_matches(matches, difficulty="medium", max_ticks=None, size=(960, 540), ball_count=1,
+                max_modifiers=2, tick_rate=HEADLESS_TICK_RATE):
+    results = {"Player": 0, "AI": 0, None: 0}
+    total_ticks = 0
+    total_score = 0
+    for _ in range(matches):
+        game = Game(None, ai_difficulty=difficulty, headless=True, size=size,
+                    ball_count=ball_count, max_modifiers=max_modifiers, tick_rate=tick_rate)
+        total_ticks += game.simulate(max_ticks=max_ticks)
+        results[game.winner] += 1
+        total_score += game.total_score
+    return results, total_ticks, total_score
+
+
+def run_batch(args):
+    return run_matches(*args)
+
+
+def run_parallel(matches, jobs, *args):
+    """Splits the matches over jobs processes and adds up their results."""
+    if jobs <= 1:
+        return run_matches(matches, *args)
+    shares = [matches // jobs + (1 if i < matches % jobs else 0) for i in range(jobs)]
+    results = {"Player": 0, "AI": 0, None: 0}
+    total_ticks = 0
+    total_score = 0
+    with multiprocessing.Pool(jobs) as pool:
+        for part, ticks, score in pool.map(run_batch, [(share,) + args for share in shares if share]):
+            for winner, count in part.items():
+                results[winner] += count
+            total_ticks += ticks
+            total_score += score
+    return results, total_ticks, total_score
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless ping bang matches")
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--difficulty", default="medium", choices=sorted(get_profiles()))
+    parser.add_argument("--max-seconds", type=float, default=120.0,
+                        help="simulated time limit per match")
+    parser.add_argument("--balls", type=int, default=1, help="balls in play at the start")
+    parser.add_argument("--modifiers", type=int, default=2, help="most modifiers on the field at once")
+    parser.add_argument("--tick-rate", type=int, default=HEADLESS_TICK_RATE,
+                        help="simulation steps per simulated second")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes to spread the matches over")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results, total_ticks, total_score = run_parallel(
+        args.matches, args.jobs, args.difficulty, int(args.max_seconds * args.tick_rate),
+        (960, 540), args.balls, args.modifiers, args.tick_rate)
+    elapsed = time.perf_counter() - start
+
+    print(f"matches:        {args.matches} ({args.difficulty}, {args.balls} balls, "
+          f"{args.tick_rate} ticks/s, {args.jobs} jobs)")
+    print(f"player wins:    {results['Player']}")
+    print(f"ai wins:        {results['AI']}")
+    print(f"timed out:      {results[None]}")
+    print(f"average score:  {total_score / args.matches:.1f}")
+    print(f"simulated time: {total_ticks / args.tick_rate:.1f}s")
+    print(f"wall time:      {elapsed:.2f}s ({args.matches / elapsed:.1f} matches/s, "
+          f"{total_ticks / elapsed:.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
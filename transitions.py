@@ -0,0 +1,135 @@
+import pygame
+
+
+def smoothstep(progress):
+    return progress * progress * (3 - 2 * progress)
+
+
+class Transition:
+    """A timed effect advanced by the main loop once per frame.
+
+    Nothing here blocks: update() moves the effect along by the frame's
+    time and draw() paints its current state over the frame. on_done is
+    called once, when the effect runs out or is finished early.
+    """
+
+    covers_screen = True
+
+    def __init__(self, duration, on_done=None):
+        self.duration = max(duration, 0.0)
+        self.elapsed = 0.0
+        self.done = False
+        self.on_done = on_done
+
+    @property
+    def progress(self):
+        if self.duration <= 0:
+            return 1.0
+        return min(1.0, self.elapsed / self.duration)
+
+    def update(self, frame_time):
+        if self.done:
+            return
+        self.elapsed += frame_time
+        self.apply()
+        if self.elapsed >= self.duration:
+            self.done = True
+            if self.on_done is not None:
+                self.on_done()
+
+    def finish(self):
+        self.update(max(0.0, self.duration - self.elapsed))
+
+    def apply(self):
+        pass
+
+    def draw(self, screen):
+        pass
+
+
+class Fade(Transition):
+    """Fades a still of the screen to a solid color."""
+
+    def __init__(self, snapshot, duration, color=(0, 0, 0), on_done=None):
+        super().__init__(duration, on_done)
+        self.snapshot = snapshot
+        self.overlay = pygame.Surface(snapshot.get_size())
+        self.overlay.fill(color)
+
+    def draw(self, screen):
+        screen.blit(self.snapshot, (0, 0))
+        self.overlay.set_alpha(int(255 * self.progress))
+        screen.blit(self.overlay, (0, 0))
+
+
+class Hold(Transition):
+    """Keeps the screen a solid color, e.g. while a sound finishes."""
+
+    def __init__(self, duration, color=(0, 0, 0), on_done=None):
+        super().__init__(duration, on_done)
+        self.color = color
+
+    def draw(self, screen):
+        screen.fill(self.color)
+
+
+class Crossfade(Transition):
+    """Fades a still of the previous screen out over the live new one."""
+
+    def __init__(self, snapshot, duration, on_done=None):
+        super().__init__(duration, on_done)
+        self.snapshot = snapshot
+
+    def draw(self, screen):
+        self.snapshot.set_alpha(int(255 * (1 - smoothstep(self.progress))))
+        screen.blit(self.snapshot, (0, 0))
+
+
+class AudioDuck(Transition):
+    """Ramps the music volume to target, e.g. under a sound effect."""
+
+    covers_screen = False
+
+    def __init__(self, target, duration, on_done=None):
+        super().__init__(duration, on_done)
+        self.target = target
+        self.start = None
+
+    def apply(self):
+        if self.start is None:
+            self.start = pygame.mixer.music.get_volume()
+        volume = self.start + (self.target - self.start) * self.progress
+        pygame.mixer.music.set_volume(max(0.0, min(1.0, volume)))
+
+
+class Transitions:
+    """The transitions currently running, drawn in the order started."""
+
+    def __init__(self):
+        self.active = []
+
+    def __bool__(self):
+        return bool(self.active)
+
+    def start(self, transition):
+        self.active.append(transition)
+        return transition
+
+    def cancel(self, kind):
+        self.active = [transition for transition in self.active if not isinstance(transition, kind)]
+
+    def update(self, frame_time):
+        for transition in list(self.active):
+            transition.update(frame_time)
+        self.active = [transition for transition in self.active if not transition.done]
+
+    def clear(self):
+        self.active = []
+
+    def covers_screen(self):
+        return any(transition.covers_screen for transition in self.active)
+
+    def draw(self, screen):
+        for transition in self.active:
+            transition.draw(screen)
+